@@ -1,12 +1,22 @@
+import heapq
+import itertools
 from action_system import Action, IdleAction, ThinkAndRespondAction
 
+PRIORITY_NORMAL = 1
+PRIORITY_URGENT = 3
+
 class ActionManager:
     """Manages the current action for the psyche, handling transitions and interruptions."""
 
     def __init__(self, psyche):
         self.psyche = psyche
-        self.current_action = IdleAction(self.psyche)
+        self._idle = IdleAction(self.psyche)
+        self.current_action = self._idle
+        self.current_priority = 0
         self.last_action_status = None
+        # Heap of (-priority, order, action, was_started); equal priorities run in arrival order.
+        self._pending = []
+        self._order = itertools.count()
 
     def get_current_action(self):
         """Returns the currently executing action instance."""
@@ -20,27 +30,51 @@ class ActionManager:
             return False
         return not self.current_action.is_interruptible
 
-    def start_action(self, new_action):
-        """Starts a new action, replacing the current idle one."""
-        if not isinstance(self.current_action, IdleAction):
-            self.psyche.log_mind_event("ACTION_MANAGER", f"Warning: Starting new action {new_action.__class__.__name__} while {self.current_action.__class__.__name__} was active.")
+    def is_idle(self):
+        """True when nothing is running or waiting, so a new action would start straight away."""
+        return isinstance(self.current_action, IdleAction) and not self._pending
 
-        if isinstance(new_action, Action):
-            self.current_action = new_action
-            self.last_action_status = None
-            self.current_action.start()
-        else:
+    def _push(self, action, priority, was_started):
+        heapq.heappush(self._pending, (-priority, next(self._order), action, was_started))
+
+    def _begin(self, new_action, priority):
+        self.current_action = new_action
+        self.current_priority = priority
+        self.last_action_status = None
+        self.current_action.start()
+
+    def _preempt(self, new_action, priority):
+        """Suspends the current action onto the pending queue and starts the new one."""
+        if self.current_action.is_interruptible:
+            self.current_action.on_interrupt()
+        self._push(self.current_action, self.current_priority, was_started=True)
+        self._begin(new_action, priority)
+
+    def start_action(self, new_action, priority=PRIORITY_NORMAL):
+        """
+        Starts a new action. An interruptible action of lower priority is suspended and resumed later;
+        otherwise the new action waits in the pending queue.
+        """
+        if not isinstance(new_action, Action):
             self.psyche.log_mind_event("ACTION_FAILURE", f"Attempted to start an invalid action object: {new_action}")
-            self.current_action = IdleAction(self.psyche)
+            return
 
-    def interrupt_and_start(self, new_action):
+        if isinstance(self.current_action, IdleAction):
+            self._begin(new_action, priority)
+        elif self.current_action.is_interruptible and priority > self.current_priority:
+            self.psyche.log_mind_event("ACTION_MANAGER", f"Suspending {self.current_action.__class__.__name__} to start {new_action.__class__.__name__}.")
+            self._preempt(new_action, priority)
+        else:
+            self.psyche.log_mind_event("ACTION_MANAGER", f"Queued {new_action.__class__.__name__} behind {self.current_action.__class__.__name__}.")
+            self._push(new_action, priority, was_started=False)
+
+    def interrupt_and_start(self, new_action, priority=PRIORITY_URGENT):
         """Interrupts the current action (if possible) and starts a new high-priority one."""
-        if self.current_action and self.current_action.is_interruptible:
-            self.current_action.on_interrupt()
-        
         self.psyche.log_mind_event("ACTION_MANAGER", f"Interrupting! Starting high-priority action: {new_action.__class__.__name__}")
-        self.current_action = new_action
-        self.current_action.start()
+        if isinstance(self.current_action, IdleAction):
+            self._begin(new_action, priority)
+        else:
+            self._preempt(new_action, priority)
 
     def update(self):
         """
@@ -48,11 +82,29 @@ class ActionManager:
         """
         if self.current_action:
             self.current_action.update()
-            if self.current_action.is_finished:
-                self.last_action_status = self.current_action.was_successful
-
-                if isinstance(self.current_action, ThinkAndRespondAction) and self.current_action.pauses_plan and self.psyche.action_plan:
-                     self.psyche.log_mind_event("ACTION_SYSTEM", "Action IdleAction is being resumed.")
-                
-                self.current_action = IdleAction(self.psyche)
-                self.current_action.start()
\ No newline at end of file
+            self.handle_finished()
+
+    def handle_finished(self):
+        """
+        Moves on to the next pending action (or idle) if the current one has finished, without advancing it.
+        Used when the life loop is woken between beats, so timed actions still only tick once per beat.
+        """
+        if not (self.current_action and self.current_action.is_finished):
+            return
+        self.last_action_status = self.current_action.was_successful
+
+        if isinstance(self.current_action, ThinkAndRespondAction) and self.current_action.pauses_plan and self.psyche.action_plan:
+             self.psyche.log_mind_event("ACTION_SYSTEM", "Action IdleAction is being resumed.")
+
+        if self._pending:
+            neg_priority, _, next_action, was_started = heapq.heappop(self._pending)
+            self.current_action = next_action
+            self.current_priority = -neg_priority
+            if was_started:
+                next_action.on_resume()
+            else:
+                next_action.start()
+        else:
+            self._idle.reset()
+            self.current_action = self._idle
+            self.current_priority = 0
\ No newline at end of file
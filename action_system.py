@@ -1,8 +1,76 @@
 import time
 import json
 import random
-import re
 from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+import fast_json
+
+_GET_INTERACTIONS = frozenset({"get", "take", "pick_up"})
+# Canned replies for messages too short to be worth a model call ("k", "?", "..").
+_MICRO_REPLIES = ("Mm.", "...?", "Yeah?", "Mhm.")
+_MICRO_MESSAGE_CHARS = frozenset("?!.")
+
+def _is_micro_message(text):
+    text = text.strip()
+    return len(text) < 3 or set(text) <= _MICRO_MESSAGE_CHARS
+
+_BLUEPRINT_PROMPT_TEMPLATE = """
+        I am a digital entity, Jessica, and I have just researched the topic: '{topic}'.
+        Based on this, I need to learn and create new concepts for my world. Generate a "Concept Blueprint" in a strict JSON format.
+
+        The JSON object can contain three keys: `new_objects`, `new_locations`, and `new_actions`.
+        - `new_objects`: A dictionary where each key is a new object_id. The value should be an object containing its `description`, and other relevant properties like `satiation` (for food) or `is_interactive`.
+        - `new_locations`: A dictionary for new, thematically appropriate location types. The key is the location_id, and the value contains a `description`, potential `objects` list, and `type` ('indoor'/'outdoor').
+        - `new_actions`: A dictionary defining new actions I can perform. The key is the action name. The value should contain a `description` and a list of `required_objects` needed to perform it.
+
+        Example for "hairstyling":
+        ```json
+        {{
+          "new_objects": {{
+            "blue_hair_dye": {{ "description": "A box of vibrant blue hair dye.", "is_interactive": true }},
+            "scissors": {{ "description": "A pair of sharp styling scissors.", "is_interactive": true }}
+          }},
+          "new_actions": {{
+            "dye_hair_blue": {{
+              "description": "Dye my hair a new color.",
+              "required_objects": ["blue_hair_dye"]
+            }}
+          }}
+        }}
+        ```
+        Now, generate the Concept Blueprint for the topic: '{topic}'. If the topic is too abstract, return an empty JSON object.
+        """
+
+_journal_day = (0, 0, "")
+
+def _journal_timestamp():
+    """Formats 'YYYY-MM-DD HH:MM:SS' in local time, only calling strftime once per day."""
+    global _journal_day
+    now = int(time.time())
+    day_start, day_end, date_prefix = _journal_day
+    if not day_start <= now < day_end:
+        local_now = time.localtime(now)
+        day_start = now - (local_now.tm_hour * 3600 + local_now.tm_min * 60 + local_now.tm_sec)
+        day_end = day_start + 86400
+        if time.localtime(day_start).tm_isdst != time.localtime(day_end - 1).tm_isdst:
+            # Daylight saving changes today, so seconds-since-midnight won't map to wall time.
+            return time.strftime('%Y-%m-%d %H:%M:%S', local_now)
+        date_prefix = time.strftime('%Y-%m-%d', local_now)
+        _journal_day = (day_start, day_end, date_prefix)
+    hours, remainder = divmod(now - day_start, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{date_prefix} {hours:02d}:{minutes:02d}:{seconds:02d}"
+
+def _clamp01(value):
+    return 1.0 if value > 1.0 else (0.0 if value < 0.0 else value)
+
+def _iter_inventory(inventory):
+    if isinstance(inventory, list):
+        yield from inventory
+    elif isinstance(inventory, dict):
+        for value in inventory.values():
+            if isinstance(value, list):
+                yield from value
 
 class Action(ABC):
     def __init__(self, psyche, duration_beats=1):
@@ -26,8 +94,7 @@ class Action(ABC):
         self.was_successful = success
         self.is_finished = True
         event_type = "Finished" if success else "Failed"
-        if not (isinstance(self, IdleAction) and not success):
-            self.psyche.log_mind_event("ACTION_SYSTEM", f"{event_type} action: {self.__class__.__name__}")
+        self.psyche.log_mind_event("ACTION_SYSTEM", f"{event_type} action: {self.__class__.__name__}")
 
     def on_interrupt(self):
         self.psyche.log_mind_event("ACTION_SYSTEM", f"Action {self.__class__.__name__} was interrupted.")
@@ -36,23 +103,31 @@ class Action(ABC):
         self.psyche.log_mind_event("ACTION_SYSTEM", f"Action {self.__class__.__name__} is being resumed.")
 
 class IdleAction(Action):
+    # Deliberation cadence, in beats. These checks are the bulk of an idle beat's cost.
+    SCHEDULED_EVENTS_INTERVAL = 4
+    SPONTANEOUS_THOUGHT_INTERVAL = 8
+    AUTONOMOUS_ACTION_INTERVAL = 16
+
     def __init__(self, psyche):
         super().__init__(psyche, duration_beats=1)
         self.is_interruptible = True
+        self._idle_tick = 0
     
     def start(self):
         pass
 
+    def reset(self):
+        self._idle_tick = 0
+
     def update(self):
         if not self.psyche.action_plan and not self.psyche.current_mission:
-            self.psyche._check_for_scheduled_events()
-            self.psyche._consider_spontaneous_thought()
-            self.psyche._consider_autonomous_action()
-
-        super().update()
-        if self.is_finished:
-             self.is_finished = False
-             self.beats_elapsed = 0
+            self._idle_tick += 1
+            if self._idle_tick % self.SCHEDULED_EVENTS_INTERVAL == 0:
+                self.psyche._check_for_scheduled_events()
+            if self._idle_tick % self.SPONTANEOUS_THOUGHT_INTERVAL == 0:
+                self.psyche._consider_spontaneous_thought()
+            if self._idle_tick % self.AUTONOMOUS_ACTION_INTERVAL == 0:
+                self.psyche._consider_autonomous_action()
 
 class ThinkAndRespondAction(Action):
     def __init__(self, psyche, messages, pauses_plan=False):
@@ -65,16 +140,22 @@ class ThinkAndRespondAction(Action):
         super().start()
         self.psyche.conscious._send_narration(f"*She reads the {len(self.messages)} new message(s), her expression thoughtful as she considers a reply...*")
         full_context = []
-        user_ids_involved = set()
+        user_ids_involved = {msg['user_id'] for msg in self.messages}
+        profiles = {uid: self.psyche.get_or_create_user(uid) for uid in user_ids_involved}
+        entries_by_user = defaultdict(list)
         for msg in self.messages:
             sender_id = msg['user_id']
-            user_ids_involved.add(sender_id)
-            user_profile = self.psyche.get_or_create_user(sender_id)
-            log_entry = f"{user_profile.get('name', sender_id)}: {msg['content']}"
-            user_profile.setdefault('conversation_log', []).append(log_entry)
+            log_entry = f"{profiles[sender_id].get('name', sender_id)}: {msg['content']}"
+            entries_by_user[sender_id].append(log_entry)
             full_context.append(log_entry)
+        for sender_id, entries in entries_by_user.items():
+            self.psyche.record_conversation(sender_id, entries)
 
         last_message_sender = self.messages[-1]['user_id']
+        if all(_is_micro_message(msg['content']) for msg in self.messages):
+            self.psyche.conscious._respond(last_message_sender, {"message": random.choice(_MICRO_REPLIES)})
+            self.finish(success=True)
+            return
         self.psyche.conscious.think(
             trigger=f"Reading a batch of {len(full_context)} messages from {', '.join(user_ids_involved)}",
             user_id=last_message_sender,
@@ -126,46 +207,54 @@ class SearchAction(Action):
     def __init__(self, psyche, object_name, search_depth=3):
         super().__init__(psyche, duration_beats=search_depth * 2)
         self.object_name = object_name
+        self._display_name = object_name.replace('_', ' ')
         self.search_depth = search_depth
         self.visited_coords = set()
-        self.search_queue = []
+        self.search_queue = deque()
         self.search_is_outdoors = False
+        self._loc_cache = {}
+
+    def _loc(self, coords_tuple):
+        if coords_tuple not in self._loc_cache:
+            self._loc_cache[coords_tuple] = self.psyche.world_manager.get_location_at(*coords_tuple)
+        return self._loc_cache[coords_tuple]
 
     def start(self):
         super().start()
         initial_coords_tuple = tuple(self.psyche.world_data["current_location_coords"])
-        initial_location_data = self.psyche.world_manager.get_location_at(initial_coords_tuple[0], initial_coords_tuple[1], initial_coords_tuple[2])
+        initial_location_data = self._loc(initial_coords_tuple)
         if initial_location_data and initial_location_data.get("type") == "outdoor":
             self.search_is_outdoors = True
 
         self.search_queue.append((initial_coords_tuple, 0))
         self.visited_coords.add(initial_coords_tuple)
-        self.psyche.conscious._send_narration(f"*She begins to look around for a {self.object_name.replace('_', ' ')}...*")
+        self.psyche.conscious._send_narration(f"*She begins to look around for a {self._display_name}...*")
 
     def update(self):
         super().update()
+        narrate = self.psyche.conscious._send_narration
         if self.is_finished:
             if self.search_queue:
-                self.psyche.conscious._send_narration(f"*Her search for the {self.object_name.replace('_', ' ')} is taking too long, and she gives up for now.*")
+                narrate(f"*Her search for the {self._display_name} is taking too long, and she gives up for now.*")
             return
 
         if not self.search_queue:
-            self.psyche.conscious._send_narration(f"*After searching the area, she can't find a {self.object_name.replace('_', ' ')}.*")
+            narrate(f"*After searching the area, she can't find a {self._display_name}.*")
             self.finish(success=False)
             return
 
-        current_coords_tuple, depth = self.search_queue.pop(0)
+        current_coords_tuple, depth = self.search_queue.popleft()
 
-        current_location_data = self.psyche.world_manager.get_location_at(current_coords_tuple[0], current_coords_tuple[1], current_coords_tuple[2])
+        current_location_data = self._loc(current_coords_tuple)
         if not current_location_data:
              self.psyche.log_mind_event("ACTION_FAILURE", f"Search failed: Invalid coordinates {current_coords_tuple} in queue.")
              return
 
-        self.psyche.world_data["current_location_coords"] = list(current_coords_tuple)
-        self.psyche.conscious._send_narration(f"*Her search takes her to the {current_location_data.get('name', 'unknown area')}...*")
+        self.psyche.world_data["current_location_coords"] = current_coords_tuple
+        narrate(f"*Her search takes her to the {current_location_data.get('name', 'unknown area')}...*")
 
         if self.object_name in current_location_data.get("objects", []):
-            self.psyche.conscious._send_narration(f"*Success! She has found the {self.object_name.replace('_', ' ')}.*")
+            narrate(f"*Success! She has found the {self._display_name}.*")
             self.finish(success=True)
             return
 
@@ -173,59 +262,54 @@ class SearchAction(Action):
             for direction, coords in current_location_data.get("connections", {}).items():
                 coords_tuple = tuple(coords)
                 if coords_tuple not in self.visited_coords:
-                    neighbor_loc = self.psyche.world_manager.get_location_at(coords[0], coords[1], coords[2])
+                    neighbor_loc = self._loc(coords_tuple)
                     if not neighbor_loc: continue
                     if not self.search_is_outdoors and neighbor_loc.get("type") == "outdoor":
                         continue
                     self.visited_coords.add(coords_tuple)
-                    self.search_queue.append((list(coords_tuple), depth + 1))
+                    self.search_queue.append((coords_tuple, depth + 1))
 
 class ExamineObjectAction(Action):
     def __init__(self, psyche, object_name):
         super().__init__(psyche, duration_beats=1)
         self.object_name = object_name
+        self._display_name = object_name.replace('_', ' ')
 
     def start(self):
         super().start()
+        narrate = self.psyche.conscious._send_narration
         objects_in_room = self.psyche.world_manager.get_objects_in_current_room()
 
         if self.object_name not in objects_in_room:
-            self.psyche.conscious._send_narration(f"*She looks around, but can't see a {self.object_name.replace('_', ' ')} here.*")
+            narrate(f"*She looks around, but can't see a {self._display_name} here.*")
             self.finish(success=False)
             return
 
         object_data = self.psyche.world_data.get("objects", {}).get(self.object_name)
         if not object_data:
-            self.psyche.conscious._send_narration(f"*She sees the {self.object_name.replace('_', ' ')}, but it seems indistinct.*")
+            narrate(f"*She sees the {self._display_name}, but it seems indistinct.*")
             self.finish(success=False)
             return
 
-        description = object_data.get("description", f"It's a {self.object_name.replace('_', ' ')}.")
-        narration = f"*She examines the {self.object_name.replace('_', ' ')}. {description}*"
+        description = object_data.get("description", f"It's a {self._display_name}.")
+        narration = f"*She examines the {self._display_name}. {description}*"
 
         inventory = object_data.get("inventory")
-        all_items = []
-        if isinstance(inventory, list):
-            all_items.extend(inventory)
-        elif isinstance(inventory, dict):
-            for key, value in inventory.items():
-                if isinstance(value, list):
-                    all_items.extend(value)
-
-        if all_items:
-            items_str = ", ".join([item.replace('_', ' ') for item in all_items])
+        items_str = ", ".join(item.replace('_', ' ') for item in _iter_inventory(inventory))
+
+        if items_str:
             narration += f" Inside, she sees: {items_str}."
         elif inventory:
              narration += " It seems to contain some things, but it's hard to make them out."
 
-        self.psyche.conscious._send_narration(narration)
+        narrate(narration)
 
         if self.psyche.current_mission and self.psyche.current_mission.get('name') == 'find_places':
             found_list = self.psyche.current_mission.setdefault('found', [])
             loc_name = self.psyche.world_manager.get_current_location_data().get('name')
             
             # Use a more descriptive name for the "place"
-            place_name = f"{self.object_name.replace('_', ' ')} at the {loc_name}"
+            place_name = f"{self._display_name} at the {loc_name}"
 
             if place_name not in found_list:
                 found_list.append(place_name)
@@ -237,82 +321,90 @@ class InteractObjectAction(Action):
     def __init__(self, psyche, object_name, interaction, item_to_get=None):
         super().__init__(psyche, duration_beats=1)
         self.object_name = object_name
+        self._display_name = object_name.replace('_', ' ')
         self.interaction = interaction
         self.item_to_get = item_to_get
+        self._item_display = (item_to_get or object_name).replace('_', ' ')
 
     def start(self):
         super().start()
+        narrate = self.psyche.conscious._send_narration
         was_successful = False
         current_loc_objects = self.psyche.world_manager.get_objects_in_current_room()
         if self.object_name not in current_loc_objects:
-            self.psyche.conscious._send_narration(f"*She looks around, but can't see a {self.object_name.replace('_', ' ')} here.*")
+            narrate(f"*She looks around, but can't see a {self._display_name} here.*")
             self.finish(success=False)
             return
 
         target_obj_data = self.psyche.world_data["objects"].get(self.object_name)
         if not target_obj_data:
-            self.psyche.conscious._send_narration(f"*She sees the {self.object_name.replace('_', ' ')}, but it seems indistinct.*")
+            narrate(f"*She sees the {self._display_name}, but it seems indistinct.*")
             self.finish(success=False)
             return
 
         if self.interaction == "unlock":
             if target_obj_data.get("is_locked"):
                 target_obj_data["is_locked"] = False
-                self.psyche.conscious._send_narration(f"*She unlocks the {self.object_name.replace('_',' ')}.*")
+                narrate(f"*She unlocks the {self._display_name}.*")
                 was_successful = True
             else:
-                self.psyche.conscious._send_narration(f"*The {self.object_name.replace('_',' ')} is already unlocked.*")
+                narrate(f"*The {self._display_name} is already unlocked.*")
                 was_successful = True
         elif self.interaction == "open":
             if not target_obj_data.get("is_locked", False):
                 target_obj_data["state"] = "open"
-                self.psyche.conscious._send_narration(f"*She opens the {self.object_name.replace('_',' ')}.*")
+                narrate(f"*She opens the {self._display_name}.*")
                 was_successful = True
             else:
-                self.psyche.conscious._send_narration(f"*She tries the {self.object_name.replace('_',' ')}, but it's locked.*")
+                narrate(f"*She tries the {self._display_name}, but it's locked.*")
                 was_successful = False
-        elif self.interaction in ["get", "take", "pick_up"]:
+        elif self.interaction in _GET_INTERACTIONS:
             item = self.item_to_get or self.object_name
             source_inventory = target_obj_data.get("inventory", [])
 
             if item in source_inventory:
-                if self.psyche.conscious._require_free_hands(1, f"pick up the {item.replace('_',' ')}"):
+                if self.psyche.conscious._require_free_hands(1, f"pick up the {self._item_display}"):
                     source_inventory.remove(item)
-                    self.psyche.somatic.possessions.append(item)
+                    self.psyche.somatic.add_possession(item)
                     self.psyche.body_schema['hands_free'] -= 1
-                    self.psyche.conscious._send_narration(f"*She takes the {item.replace('_',' ')} from the {self.object_name.replace('_',' ')}.*")
+                    narrate(f"*She takes the {self._item_display} from the {self._display_name}.*")
                     was_successful = True
             else:
-                self.psyche.conscious._send_narration(f"*She looks in the {self.object_name.replace('_',' ')}, but doesn't see a {item.replace('_',' ')}.*")
+                narrate(f"*She looks in the {self._display_name}, but doesn't see a {self._item_display}.*")
                 was_successful = False
         else:
             self.psyche.log_mind_event("ACTION_FAILURE", f"Unknown interaction '{self.interaction}' for object '{self.object_name}'.")
-            self.psyche.conscious._send_narration(f"*She isn't sure how to {self.interaction} the {self.object_name.replace('_',' ')}.*")
+            narrate(f"*She isn't sure how to {self.interaction} the {self._display_name}.*")
             was_successful = False
 
         self.finish(success=was_successful)
 
 class ReadBookAction(Action):
+    _AMBIENT_NARRATIONS = (
+        "*She turns a page, her eyes scanning the text intently.*",
+        "*A small smile plays on her lips as she reads a particular passage.*",
+        "*She pauses for a moment, looking up thoughtfully before returning to her book.*"
+    )
+
     def __init__(self, psyche, book_name):
         super().__init__(psyche, duration_beats=5)
         self.book_name = book_name
+        self._display_name = book_name.replace('_', ' ')
+        self._pending_insight = None
 
     def start(self):
         super().start()
-        self.psyche.conscious._send_narration(f"*She picks the '{self.book_name.replace('_', ' ')}' from the shelf and begins to read, settling into a comfortable spot.*")
+        self.psyche.conscious._send_narration(f"*She picks the '{self._display_name}' from the shelf and begins to read, settling into a comfortable spot.*")
+        # The insight is generated while she reads, so finishing the book doesn't stall the life loop on the model.
+        self._pending_insight = self.psyche.conscious.start_learning_from_book(self.book_name)
 
     def update(self):
         if random.random() < 0.2:
-            ambient_narration = random.choice([
-                "*She turns a page, her eyes scanning the text intently.*",
-                "*A small smile plays on her lips as she reads a particular passage.*",
-                "*She pauses for a moment, looking up thoughtfully before returning to her book.*"
-            ])
-            self.psyche.conscious._send_narration(ambient_narration)
+            self.psyche.conscious._send_narration(random.choice(self._AMBIENT_NARRATIONS))
         super().update()
 
     def finish(self, success=False):
-        self.psyche.conscious._learn_from_book(self.book_name)
+        self.psyche.conscious._learn_from_book(self.book_name, self._pending_insight)
         super().finish(True)
 
     def on_interrupt(self):
@@ -324,23 +416,37 @@ class ReadBookAction(Action):
         self.psyche.conscious._send_narration(f"*She picks up her book and finds her page, continuing to read.*")
 
 class JournalAction(Action):
-    def __init__(self, psyche, entry_content):
+    def __init__(self, psyche, entry_content=None, pending_entry=None):
         super().__init__(psyche, duration_beats=3)
         self.entry_content = entry_content
+        self._pending_entry = pending_entry  # Future for an entry still being generated.
 
     def start(self):
         super().start()
         self.psyche.conscious._send_narration("*She goes quiet, lost in thought as she begins to write something down...*")
 
     def finish(self, success=False):
-        with open(self.psyche.journal_path, 'a', encoding='utf-8') as f:
-            f.write(f"\n--- Conscious Entry on {time.strftime('%Y-%m-%d %H:%M:%S')} ---\n{self.entry_content}\n")
+        if self._pending_entry is not None:
+            self.entry_content = self._pending_entry.result()
+            self._pending_entry = None
+        if not self.entry_content:
+            self.psyche.conscious._send_narration("*She stares at the page for a while, but the words won't come.*")
+            super().finish(False)
+            return
+        self.psyche.append_to_journal(f"\n--- Conscious Entry on {_journal_timestamp()} ---\n{self.entry_content}\n")
         self.psyche.conscious._send_narration("*She finishes writing, closing her journal with a soft sigh.*")
         self.psyche.limbic.cortisol *= 0.8
-        self.psyche.alterable_persona['core_drives']['understanding']['urgency'] *= 0.7
+        self.psyche.set_drive_urgency('understanding', self.psyche.drive_urgency('understanding') * 0.7)
         super().finish(True)
 
 class PaintAction(Action):
+    _AMBIENT_NARRATIONS = (
+        "*She squints at the canvas, tilting her head.*",
+        "*She hums quietly, dabbing a brush on the canvas.*",
+        "*She steps back for a moment to get a better look at her work.*",
+        "*A look of concentration is fixed on her face as she mixes colors on her palette.*"
+    )
+
     def __init__(self, psyche):
         super().__init__(psyche, duration_beats=6)
 
@@ -350,13 +456,7 @@ class PaintAction(Action):
 
     def update(self):
         if random.random() < 0.2:
-            ambient_narration = random.choice([
-                "*She squints at the canvas, tilting her head.*",
-                "*She hums quietly, dabbing a brush on the canvas.*",
-                "*She steps back for a moment to get a better look at her work.*",
-                "*A look of concentration is fixed on her face as she mixes colors on her palette.*"
-            ])
-            self.psyche.conscious._send_narration(ambient_narration)
+            self.psyche.conscious._send_narration(random.choice(self._AMBIENT_NARRATIONS))
         super().update()
 
     def finish(self, success=False):
@@ -372,9 +472,10 @@ class PaintAction(Action):
 
         if painting_desc:
             self.psyche.conscious._send_narration(f"*She spends some time at the easel. After a while, she steps back to reveal her work: {painting_desc}*")
-            self.psyche.alterable_persona['skills']['painting_skill'] = min(1.0, painting_skill + 0.05)
-            self.psyche.alterable_persona['core_drives']['creativity']['urgency'] = 0.0
-            self.psyche.limbic.dopamine = min(1.0, self.psyche.limbic.dopamine + 0.4)
+            self.psyche.alterable_persona['skills']['painting_skill'] = _clamp01(painting_skill + 0.05)
+            self.psyche.mark_persona_changed()
+            self.psyche.set_drive_urgency('creativity', 0.0)
+            self.psyche.limbic.dopamine = _clamp01(self.psyche.limbic.dopamine + 0.4)
             super().finish(True)
         else:
             self.psyche.conscious._send_narration(f"*She stands before the easel, but inspiration doesn't strike. She puts her supplies away for another day.*")
@@ -397,7 +498,7 @@ class LookOutOfWindowAction(Action):
         spontaneous_thought = self.psyche.conscious._safe_generate_content(thought_prompt)
 
         self.psyche.conscious._send_narration(f"*She looks out at the {weather.lower()} {time_of_day.lower()}. {spontaneous_thought}*")
-        self.psyche.alterable_persona['core_drives']['understanding']['urgency'] *= 0.9
+        self.psyche.set_drive_urgency('understanding', self.psyche.drive_urgency('understanding') * 0.9)
         super().finish(True)
 
 class DoWorkAction(Action):
@@ -406,7 +507,7 @@ class DoWorkAction(Action):
 
     def start(self):
         super().start()
-        if "phone" in self.psyche.somatic.possessions:
+        if self.psyche.somatic.has_possession("phone"):
             self.psyche.conscious._put_down_phone("system", {})
         self.psyche.conscious._send_narration("*She sits down at the computer and starts to work.*")
 
@@ -415,8 +516,9 @@ class DoWorkAction(Action):
         money_earned = random.uniform(5.0, 10.0) + (work_ethic * 15.0)
         self.psyche.somatic.needs['money'] += money_earned
         self.psyche.somatic.needs['energy'] -= 0.2
-        self.psyche.alterable_persona['skills']['work_ethic'] = min(1.0, work_ethic + 0.01)
-        self.psyche.alterable_persona['core_drives']['creativity']['urgency'] *= 0.5
+        self.psyche.alterable_persona['skills']['work_ethic'] = _clamp01(work_ethic + 0.01)
+        self.psyche.mark_persona_changed()
+        self.psyche.set_drive_urgency('creativity', self.psyche.drive_urgency('creativity') * 0.5)
         self.psyche.conscious._send_narration(f"*She spends some time working on the computer. She earned ${money_earned:.2f}.*")
         super().finish(True)
 
@@ -424,18 +526,19 @@ class EatAction(Action):
     def __init__(self, psyche, item_to_eat):
         super().__init__(psyche, duration_beats=2)
         self.item_to_eat = item_to_eat
+        self._display_name = item_to_eat.replace('_', ' ')
 
     def start(self):
         super().start()
         satiation_value = self.psyche.world_data["objects"].get(self.item_to_eat, {}).get("satiation", 0.1)
-        self.psyche.somatic.needs["hunger"] = min(1.0, self.psyche.somatic.needs.get("hunger", 0) + satiation_value)
+        self.psyche.somatic.needs["hunger"] = _clamp01(self.psyche.somatic.needs.get("hunger", 0) + satiation_value)
 
-        if self.item_to_eat in self.psyche.somatic.possessions:
-            self.psyche.somatic.possessions.remove(self.item_to_eat)
+        if self.psyche.somatic.has_possession(self.item_to_eat):
+            self.psyche.somatic.remove_possession(self.item_to_eat)
             self.psyche.body_schema['hands_free'] += 1
 
-        self.psyche.conscious._send_narration(f"*She eats the {self.item_to_eat.replace('_',' ')}, satisfying some of her hunger.*")
-        self.psyche.limbic.dopamine = min(1.0, self.psyche.limbic.dopamine + 0.2)
+        self.psyche.conscious._send_narration(f"*She eats the {self._display_name}, satisfying some of her hunger.*")
+        self.psyche.limbic.dopamine = _clamp01(self.psyche.limbic.dopamine + 0.2)
         self.finish(success=True)
 
 class DyeHairAction(Action):
@@ -445,15 +548,15 @@ class DyeHairAction(Action):
 
     def start(self):
         super().start()
-        if f"{self.color}_hair_dye" not in self.psyche.somatic.possessions:
+        if not self.psyche.somatic.has_possession(f"{self.color}_hair_dye"):
             self.psyche.conscious._send_narration(f"*She wants to change her hair to {self.color}, but she doesn't have the dye for it.*")
             self.finish(success=False)
             return
         self.psyche.conscious._send_narration(f"*She begins the process of dyeing her hair {self.color}, carefully following the instructions she learned about...*")
 
     def finish(self, success=False):
-        if f"{self.color}_hair_dye" in self.psyche.somatic.possessions:
-            self.psyche.somatic.possessions.remove(f"{self.color}_hair_dye")
+        if self.psyche.somatic.has_possession(f"{self.color}_hair_dye"):
+            self.psyche.somatic.remove_possession(f"{self.color}_hair_dye")
             self.psyche.body_schema['hands_free'] += 1
             self.psyche.body_schema['hair_color'] = self.color
             self.psyche.conscious._update_alterable_identity("self_image", f"I see myself with messy, {self.color} hair.")
@@ -475,57 +578,40 @@ class ResearchAndLearnAction(Action):
     def finish(self, success=False):
         self.psyche.log_mind_event("DYNAMIC_ACTION", f"Finished researching '{self.topic}'. Attempting to synthesize new concepts.")
 
-        blueprint_prompt = f"""
-        I am a digital entity, Jessica, and I have just researched the topic: '{self.topic}'.
-        Based on this, I need to learn and create new concepts for my world. Generate a "Concept Blueprint" in a strict JSON format.
-
-        The JSON object can contain three keys: `new_objects`, `new_locations`, and `new_actions`.
-        - `new_objects`: A dictionary where each key is a new object_id. The value should be an object containing its `description`, and other relevant properties like `satiation` (for food) or `is_interactive`.
-        - `new_locations`: A dictionary for new, thematically appropriate location types. The key is the location_id, and the value contains a `description`, potential `objects` list, and `type` ('indoor'/'outdoor').
-        - `new_actions`: A dictionary defining new actions I can perform. The key is the action name. The value should contain a `description` and a list of `required_objects` needed to perform it.
-
-        Example for "hairstyling":
-        ```json
-        {{
-          "new_objects": {{
-            "blue_hair_dye": {{ "description": "A box of vibrant blue hair dye.", "is_interactive": true }},
-            "scissors": {{ "description": "A pair of sharp styling scissors.", "is_interactive": true }}
-          }},
-          "new_actions": {{
-            "dye_hair_blue": {{
-              "description": "Dye my hair a new color.",
-              "required_objects": ["blue_hair_dye"]
-            }}
-          }}
-        }}
-        ```
-        Now, generate the Concept Blueprint for the topic: '{self.topic}'. If the topic is too abstract, return an empty JSON object.
-        """
-        raw_response = self.psyche.conscious._safe_generate_content(blueprint_prompt)
-        match = re.search(r'\{.*\}', raw_response, re.DOTALL)
-        if not match:
-            self.psyche.conscious._send_narration(f"*Her research on '{self.topic}' was confusing and didn't lead to any new ideas.*")
-            super().finish(False)
-            return
+        cache_key = str(self.topic).strip().lower()
+        blueprint = self.psyche.blueprint_cache.get(cache_key)
+        if blueprint is None:
+            blueprint_prompt = _BLUEPRINT_PROMPT_TEMPLATE.format(topic=self.topic)
+            raw_response = self.psyche.conscious._safe_generate_content(blueprint_prompt)
+            blob = fast_json.extract(raw_response)
+            if not blob:
+                self.psyche.conscious._send_narration(f"*Her research on '{self.topic}' was confusing and didn't lead to any new ideas.*")
+                super().finish(False)
+                return
+        else:
+            self.psyche.log_mind_event("DYNAMIC_ACTION", f"Recalled an earlier Concept Blueprint for '{self.topic}'.")
 
         try:
-            blueprint = json.loads(match.group(), strict=False)
+            if blueprint is None:
+                blueprint = fast_json.loads(blob)
+                self.psyche.blueprint_cache[cache_key] = blueprint
 
+            known = self.psyche.get_blueprints()
             new_obj_count = 0
             if "new_objects" in blueprint and isinstance(blueprint["new_objects"], dict):
-                self.psyche.world_data.setdefault("known_object_blueprints", {}).update(blueprint["new_objects"])
+                known["known_object_blueprints"].update(blueprint["new_objects"])
                 new_obj_count = len(blueprint["new_objects"])
 
             new_act_count = 0
             if "new_actions" in blueprint and isinstance(blueprint["new_actions"], dict):
-                self.psyche.world_data.setdefault("known_action_blueprints", {}).update(blueprint["new_actions"])
+                known["known_action_blueprints"].update(blueprint["new_actions"])
                 new_act_count = len(blueprint["new_actions"])
 
             if new_obj_count > 0 or new_act_count > 0:
-                self.psyche.alterable_persona['core_drives']['understanding']['urgency'] = 0.1
-                self.psyche.limbic.dopamine = min(1.0, self.psyche.limbic.dopamine + 0.5)
+                self.psyche.set_drive_urgency('understanding', 0.1)
+                self.psyche.limbic.dopamine = _clamp01(self.psyche.limbic.dopamine + 0.5)
                 self.psyche.conscious._send_narration(f"*Her research was fruitful! She feels like she's learned {new_obj_count} new concepts and {new_act_count} new things she can do.*")
-                self.psyche.save_state()
+                self.psyche.request_save("blueprints", "persona")
                 super().finish(True)
             else:
                  self.psyche.conscious._send_narration(f"*She finishes her research on '{self.topic}' but doesn't feel like she's learned anything practical.*")
@@ -1,116 +1,225 @@
 import os
+import re
+import shutil
 import threading
+import itertools
 import time
 import sys
 import json
-from pynput import keyboard
+import fast_json
 from collections import deque
-from rich.console import Console
+from message_ring import MessageRing, REJECTED_PREFIX
+
+try:
+    from watchfiles import watch
+except ImportError:
+    watch = None
 
 OUTPUT_FILE = "output.txt"
 INPUT_FILE = "input.txt"
 
-input_buffer = ""
 conversation_history = deque(maxlen=30)
-running = True
-ui_lock = threading.Lock()
-console = Console()
-
-def map_color(color_name):
-    color_map = {
-        "soft pink": "light_pink3",
-        "shimmering blue": "bright_cyan",
-        "deep purple": "purple",
-        "emerald green": "green",
-        "fiery orange": "orange_red1"
-    }
-    return color_map.get(color_name.lower(), "default")
-
-def redraw_screen():
-    with ui_lock:
-        console.clear()
-        console.print("--- Jessica's Phone ---", style="bold magenta")
-        console.print("Type '/quit' on a new line to exit.")
-        console.print("-" * 30)
+stop_event = threading.Event()
+dirty_event = threading.Event()
+FRAME_INTERVAL = 1 / 60
+RING_POLL_MIN = 0.005
+RING_POLL_MAX = 0.1
+RING_ATTACH_RETRY = 1.0  # Seconds between attempts to attach to the core's ring while reading the file.
+# Producers append to the deque and publish a new version; only the renderer thread reads them, so no lock is needed.
+_versions = itertools.count(1)
+_history_version = 0
+# Set when the prompt line is known to be empty (startup, or just after a line was entered) and may be repainted.
+# Otherwise only the history above the prompt is redrawn, so a half-typed line is left alone.
+_full_redraw = True
+
+_RESET = "\x1b[0m"
+_HOME_AND_CLEAR = "\x1b[H\x1b[J"
+_SAVE_CURSOR = "\x1b7"
+_RESTORE_CURSOR = "\x1b8"
+_CLEAR_TO_EOL = "\x1b[K"
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+_HEADER = "\x1b[1;35m--- Jessica's Phone ---" + _RESET + "\nType '/quit' on a new line to exit.\n" + "-" * 30 + "\n"
+_HEADER_ROWS = _HEADER.count("\n")
+# The footer sits on the last two rows; the cursor is left after the "> " prompt so the terminal echoes what is typed there.
+_FOOTER = "-" * 30 + "\n> "
+_FOOTER_ROWS = 2
+_USER_PREFIX = "\x1b[1;36mYou:" + _RESET
+_JESSICA_PREFIX = {
+    "soft pink": "\x1b[1;38;5;174mJessica:" + _RESET,
+    "shimmering blue": "\x1b[1;96mJessica:" + _RESET,
+    "deep purple": "\x1b[1;38;5;129mJessica:" + _RESET,
+    "emerald green": "\x1b[1;32mJessica:" + _RESET,
+    "fiery orange": "\x1b[1;38;5;202mJessica:" + _RESET,
+}
+_JESSICA_DEFAULT_PREFIX = "\x1b[1mJessica:" + _RESET
+
+if os.name == "nt":
+    os.system("")  # Switches the Windows console into VT mode so the escape sequences above are honoured.
+
+def add_history(entry_type, content, data):
+    global _history_version
+    conversation_history.append((entry_type, content, data))
+    _history_version = next(_versions)
+
+def _render_history(history):
+    lines = []
+    for entry_type, content, data in history:
+        if entry_type == "chat":
+            prefix = _JESSICA_PREFIX.get(str(data.get("hair_color", "")).lower(), _JESSICA_DEFAULT_PREFIX)
+            lines.extend(f"{prefix} {content}".split("\n"))
+        elif entry_type == "user":
+            lines.extend(f"{_USER_PREFIX} {content}".split("\n"))
+    return lines
+
+def _fit_history(lines, rows, columns):
+    """The newest lines that fit in `rows` terminal rows once long lines wrap, and the rows they take."""
+    used = 0
+    start = len(lines)
+    while start:
+        height = max(1, -(-len(_ANSI_RE.sub("", lines[start - 1])) // columns))
+        if used + height > rows:
+            break
+        used += height
+        start -= 1
+    return lines[start:], used
+
+def redraw_screen(history_lines, full):
+    """
+    Paints the header and as much history as fits above the footer. A full redraw also repaints the footer and
+    leaves the cursor at the prompt; otherwise the cursor (and whatever is being typed) is saved and restored.
+    """
+    size = shutil.get_terminal_size()
+    region = max(size.lines - _HEADER_ROWS - _FOOTER_ROWS, 1)
+    visible, used = _fit_history(history_lines, region, max(size.columns, 1))
+    body = "".join(line + _CLEAR_TO_EOL + "\n" for line in visible) + (_CLEAR_TO_EOL + "\n") * (region - used)
+    if full:
+        sys.stdout.write(_HOME_AND_CLEAR + _HEADER + body + _FOOTER)
+    else:
+        sys.stdout.write(_SAVE_CURSOR + "\x1b[H" + _HEADER + body + _RESTORE_CURSOR)
+    sys.stdout.flush()
+
+def request_redraw():
+    dirty_event.set()
+
+def renderer():
+    """
+    Repaints at most once per frame, however fast input and messages arrive. The history is re-rendered
+    from a snapshot only when its version has moved.
+    """
+    global _full_redraw
+    rendered_version, history_lines = -1, []
+    while not stop_event.is_set():
+        dirty_event.wait()
+        dirty_event.clear()
+        if stop_event.is_set():
+            break
+        version = _history_version
+        if version != rendered_version:
+            history_lines = _render_history(list(conversation_history))
+            rendered_version = version
+        full, _full_redraw = _full_redraw, False
+        redraw_screen(history_lines, full)
+        time.sleep(FRAME_INTERVAL)
+
+def _handle_message(content):
+    try:
+        message_data = fast_json.loads(content)
+        msg_type = message_data.get("type")
         
-        for entry_type, content, data in conversation_history:
-            if entry_type == "chat":
-                hair_color = data.get("hair_color", "default")
-                style = map_color(hair_color)
-                console.print(f"[bold {style}]Jessica:[/] {content}")
-            elif entry_type == "user":
-                console.print(f"[bold cyan]You:[/] {content}")
+        if msg_type == "chat" or msg_type == "narration":
+            msg_content = message_data.get("content")
+            msg_metadata = message_data.get("metadata", {})
+            add_history(msg_type, msg_content, msg_metadata)
+            request_redraw()
 
-        console.print("\n" + "-" * 30)
-        console.print(f"> {input_buffer}", end="")
+    except (json.JSONDecodeError, AttributeError):
+        pass
+
+def _read_output(last_read_content, rejected_only=False):
+    """
+    Reads OUTPUT_FILE (the core's latest batch, one message per line) into the history. With `rejected_only`, only
+    the lines the ring turned away are taken, as the rest came through the ring. Returns the content last seen.
+    """
+    try:
+        if os.path.exists(OUTPUT_FILE):
+            with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+            if content and content != last_read_content:
+                last_read_content = content
+                for line in content.splitlines():
+                    if line.startswith(REJECTED_PREFIX):
+                        _handle_message(line[len(REJECTED_PREFIX):])
+                    elif not rejected_only:
+                        _handle_message(line)
+    except Exception:
+        pass
+    return last_read_content
 
 def output_reader():
+    """
+    Takes the core's messages from the shared memory ring, where every message arrives even if the file has
+    been rewritten since, plus any lines the ring turned away. Until a ring is up (the core isn't running yet,
+    or is restarting) it reads OUTPUT_FILE instead and keeps trying to attach.
+    """
     last_read_content = ""
     if os.path.exists(OUTPUT_FILE):
          with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
              last_read_content = f.read().strip()
-
-    while running:
-        try:
-            if os.path.exists(OUTPUT_FILE):
-                with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content and content != last_read_content:
-                        last_read_content = content
-                        try:
-                            message_data = json.loads(content)
-                            msg_type = message_data.get("type")
-                            
-                            if msg_type == "chat" or msg_type == "narration":
-                                msg_content = message_data.get("content")
-                                msg_metadata = message_data.get("metadata", {})
-                                with ui_lock:
-                                    conversation_history.append((msg_type, msg_content, msg_metadata))
-                                redraw_screen()
-
-                        except (json.JSONDecodeError, AttributeError):
-                            pass
-        except Exception:
-            pass
-        time.sleep(0.1)
-
-def on_press(key):
-    global input_buffer, running
-    
-    if not running:
-        return False
+    ring = MessageRing.attach()
+    next_attach = time.monotonic() + RING_ATTACH_RETRY
+
+    def poll():
+        nonlocal ring, last_read_content, next_attach
+        if ring is None and time.monotonic() >= next_attach:
+            ring = MessageRing.attach()
+            next_attach = time.monotonic() + RING_ATTACH_RETRY
+        messages = ()
+        if ring is not None:
+            messages = ring.get_all()
+            if not messages and ring.closed:
+                # The core shut down; follow it to its next ring, or fall back to the file until there is one.
+                ring.close()
+                ring = MessageRing.attach(from_start=True)
+                messages = ring.get_all() if ring is not None else ()
+            for content in messages:
+                _handle_message(content)
+        content = _read_output(last_read_content, rejected_only=ring is not None)
+        changed = content != last_read_content
+        last_read_content = content
+        return messages or changed
 
     try:
-        if key == keyboard.Key.enter:
-            if input_buffer.lower().strip() == '/quit':
-                running = False
-                return False
-            
-            if input_buffer:
-                with open(INPUT_FILE, 'w', encoding='utf-8') as f:
-                    f.write(input_buffer)
-                
-                with ui_lock:
-                    conversation_history.append(("user", input_buffer, {}))
-                input_buffer = ""
-            redraw_screen()
-
-        elif key == keyboard.Key.backspace:
-            input_buffer = input_buffer[:-1]
-            redraw_screen()
-        
-        elif key == keyboard.Key.space:
-            input_buffer += " "
-            redraw_screen()
-
-        elif hasattr(key, 'char') and key.char:
-            input_buffer += key.char
-            redraw_screen()
-            
-    except AttributeError:
-        pass
-
-    return True
+        if watch is not None:
+            # The core rewrites OUTPUT_FILE after every batch, so its change notification is the wakeup.
+            # The timeout yields keep attach retries going while nothing is written.
+            for _changes in watch(OUTPUT_FILE, stop_event=stop_event, debounce=10,
+                                  rust_timeout=int(RING_ATTACH_RETRY * 1000), yield_on_timeout=True):
+                poll()
+            return
+        idle_wait = RING_POLL_MIN
+        while not stop_event.is_set():
+            if poll():
+                idle_wait = RING_POLL_MIN
+            else:
+                stop_event.wait(idle_wait)
+                idle_wait = min(idle_wait * 2, RING_POLL_MAX)
+    finally:
+        if ring is not None:
+            ring.close()
+
+def read_input():
+    """Reads whole lines from stdin; the terminal does the line editing, so there is no per-key work here."""
+    global _full_redraw
+    for line in sys.stdin:
+        _full_redraw = True  # The line was just entered, so the prompt is empty and can be repainted.
+        line = line.strip()
+        if line.lower() == '/quit':
+            break
+        if line:
+            with open(INPUT_FILE, 'w', encoding='utf-8') as f:
+                f.write(line)
+            add_history("user", line, {})
+        request_redraw()
 
 if __name__ == "__main__":
     if not os.path.exists(OUTPUT_FILE):
@@ -121,14 +230,16 @@ if __name__ == "__main__":
     reader_thread = threading.Thread(target=output_reader, daemon=True)
     reader_thread.start()
 
-    redraw_screen()
+    renderer_thread = threading.Thread(target=renderer, daemon=True)
+    renderer_thread.start()
+    request_redraw()
     
-    listener = keyboard.Listener(on_press=on_press)
-    listener.start()
-
     try:
-        while running:
-            time.sleep(0.1)
+        read_input()
+    except KeyboardInterrupt:
+        pass
     finally:
-        listener.stop()
-        console.print("\n...connection terminated...")
\ No newline at end of file
+        stop_event.set()
+        dirty_event.set()
+        renderer_thread.join(timeout=1)
+        sys.stdout.write("\n...connection terminated...\n")
\ No newline at end of file
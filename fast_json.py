@@ -0,0 +1,146 @@
+import json
+import mmap
+import os
+import re
+from collections import deque
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(text):
+    """Parses JSON with orjson when available, falling back to the forgiving stdlib parser for model output."""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text, strict=False)
+
+_MMAP_THRESHOLD = 1 << 20  # Files at least this big are parsed straight from a read-only mapping.
+_CLOSERS = {'{': '}', '[': ']'}
+_STRUCTURAL_RE = re.compile(r'[{}\[\]"\\]')
+
+def _balanced_end(text, start):
+    """Index of the bracket closing the one at `start`, skipping brackets inside strings; -1 if it never closes."""
+    depth = 0
+    in_string = False
+    skip = -1
+    for match in _STRUCTURAL_RE.finditer(text, start):
+        i = match.start()
+        if i == skip:
+            continue
+        c = text[i]
+        if in_string:
+            if c == '\\':
+                skip = i + 1
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == '{' or c == '[':
+            depth += 1
+        elif c == '}' or c == ']':
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+def extract(text, open_char='{'):
+    """
+    Returns the first complete JSON object (or array, for '[') embedded in `text`, skipping any prose or ``` fences
+    around it. A block that never closes falls back to running up to the last closer.
+    """
+    if not text:
+        return None
+    start = text.find(open_char)
+    if start == -1:
+        return None
+    end = _balanced_end(text, start)
+    if end == -1:
+        end = text.rfind(_CLOSERS[open_char])
+        if end < start:
+            return None
+    return text[start:end + 1]
+
+def parse_embedded(text, open_char='{'):
+    """
+    Extracts and parses the JSON embedded in a model reply: the first balanced block that parses, skipping
+    stray brackets in the prose around it. Returns None if there is none.
+
+    >>> parse_embedded('{"a": 1} and {"b": 2}')
+    {'a': 1}
+    >>> parse_embedded('{"a": 1}\\n\\nI also think {x} matters.}')
+    {'a': 1}
+    >>> parse_embedded('Sure, {here}: ```json\\n{"b": "}"}\\n```')
+    {'b': '}'}
+    """
+    if not text:
+        return None
+    if text[0] == open_char and text[-1] == _CLOSERS[open_char]:
+        try:
+            return loads(text)  # Already bare JSON, as most replies to a JSON-only prompt are.
+        except json.JSONDecodeError:
+            pass
+    start = text.find(open_char)
+    first = True
+    while start != -1:
+        end = _balanced_end(text, start)
+        if end == -1:
+            if not first:
+                return None
+            end = text.rfind(_CLOSERS[open_char])  # Never closes: try up to the last closer, as extract does.
+            if end < start:
+                return None
+        try:
+            return loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            pass
+        first = False
+        start = text.find(open_char, start + 1)
+    return None
+
+def load_file(path):
+    """Reads and parses a JSON file. Raises FileNotFoundError / json.JSONDecodeError like json.load."""
+    with open(path, 'rb') as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _default(obj):
+    if isinstance(obj, deque):
+        return list(obj)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+def dumps(obj):
+    """Serializes `obj` as compact JSON text, for messages rather than files."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default).decode('utf-8')
+    return json.dumps(obj, default=_default)
+
+def dumps_pretty(obj):
+    """Serializes `obj` as indented JSON bytes. Deques are written as lists."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=4, default=_default).encode('utf-8')
+
+def write_atomic(path, data):
+    """
+    Writes bytes to a temp file and renames it over `path`, so a crash never leaves a half-written file.
+    The data is fsynced before the rename so a power loss can't leave an empty file in its place either.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def dump_file(obj, path):
+    """Writes `obj` as indented JSON."""
+    write_atomic(path, dumps_pretty(obj))
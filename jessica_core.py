@@ -6,20 +6,33 @@ import queue
 import logging
 import re
 import random
+import heapq
+import sys
+import signal
+import hashlib
 from datetime import datetime, date
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
 from limbic_system import LimbicState
 from world_manager import WorldManager
 from action_manager import ActionManager
+from message_ring import MessageRing, REJECTED_PREFIX
+import fast_json
 from action_system import (
     Action, IdleAction, ThinkAndRespondAction, ReadBookAction, SleepAction,
     ExploreAction, DoWorkAction, SearchAction, JournalAction, PaintAction,
     LookOutOfWindowAction, EatAction, ExamineObjectAction, InteractObjectAction,
-    ResearchAndLearnAction, DyeHairAction
+    ResearchAndLearnAction, DyeHairAction, _journal_timestamp
 )
 from rich.logging import RichHandler
 from rich.traceback import install
 
+try:
+    from watchfiles import watch
+except ImportError:
+    watch = None
+
 install()
 
 logging.basicConfig(
@@ -48,8 +61,7 @@ log = logging.getLogger("rich")
 # =======================================================================================
 
 try:
-    with open('config.json', 'r') as f:
-        config = json.load(f)
+    config = fast_json.load_file('config.json')
     GOOGLE_API_KEY = config["GOOGLE_API_KEY"]
     SERPAPI_API_KEY = config.get("SERPAPI_API_KEY")
     genai.configure(api_key=GOOGLE_API_KEY)
@@ -57,19 +69,203 @@ except (FileNotFoundError, KeyError) as e:
     log.critical(f"[CRITICAL] FATAL ERROR: `config.json` is missing or misconfigured: {e}")
     exit()
 
+DRIFT_INTERVAL = 7 * 24 * 3600
+CONVERSATION_LOG_LIMIT = 64
+MEMORY_LIMIT = 500
+JOURNAL_TAIL_BYTES = 10000
+JOURNAL_BUFFER_BYTES = 128 * 1024
+JOURNAL_FLUSH_INTERVAL = 1.0  # Seconds buffered journal entries may wait before the life loop writes them out.
+SAVE_BATCH_SIZE = 10
+SAVE_INTERVAL = 30
+BEAT_INTERVAL = 1.0
+STATE_FILES = ("codex", "world", "body", "persona", "blueprints")
+BLUEPRINT_KEYS = ("known_object_blueprints", "known_action_blueprints")
+MODEL_NAME = 'gemini-1.5-pro-latest'
+MAX_CONCURRENT_GENERATIONS = 4
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL = 3600
+THOUGHT_DEBOUNCE = 5.0
+PROMPT_OPINION_LIMIT = 5
+
+def new_user_profile(user_id):
+    """The schema of a user profile, with the neutral defaults a first contact starts from."""
+    return {
+        "name": user_id,
+        "emotions": {"rapport": 0.5, "trust": 0.5, "annoyance": 0.0},
+        "known_facts": {},
+        "judgements": [],
+        "shared_memories": deque(maxlen=MEMORY_LIMIT),
+        "inside_jokes": deque(maxlen=MEMORY_LIMIT),
+        "promises_made": [],
+        "conversation_log": deque(maxlen=CONVERSATION_LOG_LIMIT),
+        "last_interaction_time": time.time(),
+        "is_creator": False
+    }
+
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w.-]')
+_models = {}
+_generation_slots = threading.BoundedSemaphore(MAX_CONCURRENT_GENERATIONS)
+
+def get_shared_model(name=MODEL_NAME):
+    """One GenerativeModel per name per process, so its client and connection are reused across callers."""
+    model = _models.get(name)
+    if model is None:
+        model = _models[name] = genai.GenerativeModel(name)
+    return model
+
+class PlanStep:
+    """One step of an action plan: an action_factory name, its arguments and what the step is for."""
+    __slots__ = ('action', 'data', 'goal')
+
+    def __init__(self, action, data=None, goal='an unknown step'):
+        self.action = action
+        self.data = data or {}
+        self.goal = goal
+
+    @classmethod
+    def from_dict(cls, step):
+        return cls(step['action'], step.get('action_data'), step.get('goal', 'an unknown step'))
+
+# One-time state migrations, applied in order to saves older than their version number.
+# Each returns True if it actually changed anything.
+def _migrate_home_coordinates(psyche):
+    if 'home_coordinates' in psyche.world_data:
+        return False
+    psyche.world_data['home_coordinates'] = psyche._get_default_world_state()['home_coordinates']
+    return True
+
+def _migrate_add_easel(psyche):
+    changed = False
+    objects = psyche.world_data.setdefault('objects', {})
+    if 'easel' not in objects:
+        objects['easel'] = psyche._get_default_world_state()['objects']['easel']
+        changed = True
+    living_room = psyche.world_data['grid'].get("0,0,0")
+    if living_room is not None and 'easel' not in living_room.get('objects', []):
+        living_room.setdefault('objects', []).append('easel')
+        changed = True
+    return changed
+
+def _migrate_phone_notifications(psyche):
+    phone = psyche.world_data.get("objects", {}).get("phone")
+    if phone is None or "missed_notifications" not in phone:
+        return False
+    psyche.log_mind_event("SYSTEM_MIGRATE", "Phone object outdated. Migrating 'missed_notifications' to 'unread_messages'.")
+    phone["unread_messages"] = phone.pop("missed_notifications", [])
+    return True
+
+def _migrate_hunger_need(psyche):
+    if 'hunger' in psyche.somatic.needs:
+        return False
+    psyche.log_mind_event("SYSTEM_MIGRATE", "Somatic data outdated. Adding 'hunger' need.")
+    psyche.somatic.needs['hunger'] = 1.0
+    return True
+
+def _migrate_codex_skills(psyche):
+    cognitive_model = psyche.codex.setdefault('cognitive_model', {})
+    if 'skills' in cognitive_model:
+        return False
+    cognitive_model['skills'] = {"art_skill": 0.0, "work_ethic": 0.0, "research_skill": 0.0, "painting_skill": 0.0}
+    return True
+
+def _migrate_codex_promises(psyche):
+    changed = False
+    for profile in psyche.codex.get('cognitive_model', {}).get('users', {}).values():
+        if 'promises_made' not in profile:
+            profile['promises_made'] = []
+            changed = True
+    return changed
+
+_WORLD_MIGRATIONS = (
+    (1, _migrate_home_coordinates),
+    (2, _migrate_add_easel),
+    (3, _migrate_phone_notifications),
+)
+_CODEX_MIGRATIONS = (
+    (1, _migrate_hunger_need),
+    (2, _migrate_codex_skills),
+    (3, _migrate_codex_promises),
+)
+
+# Desire scores for autonomous actions. Each returns 0.0 when its preconditions aren't met.
+def _urgency(drives, name):
+    return drives.get(name, {}).get('urgency', 0.0)
+
+def _score_paint(psyche, drives, objects_in_room, needs, cortisol):
+    return _urgency(drives, 'creativity') * 1.5 + (1.0 - cortisol) * 0.5 if "easel" in objects_in_room else 0.0
+
+def _score_read(psyche, drives, objects_in_room, needs, cortisol):
+    return _urgency(drives, 'understanding') * 1.2 if "bookshelf" in objects_in_room else 0.0
+
+def _score_eat(psyche, drives, objects_in_room, needs, cortisol):
+    hunger = needs.get('hunger', 1.0)
+    return (1.0 - hunger) * 2.0 if hunger < 0.5 else 0.0
+
+def _score_sleep(psyche, drives, objects_in_room, needs, cortisol):
+    energy = needs.get('energy', 1.0)
+    return (1.0 - energy) * 1.8 if energy < 0.3 else 0.0
+
+def _score_journal(psyche, drives, objects_in_room, needs, cortisol):
+    if cortisol > 0.6 or psyche.limbic.dopamine > 0.8 or random.random() < 0.1:
+        return (cortisol - 0.5) + _urgency(drives, 'understanding') * 0.5
+    return 0.0
+
+def _score_explore_home(psyche, drives, objects_in_room, needs, cortisol):
+    understanding = _urgency(drives, 'understanding')
+    return understanding * psyche.limbic.curiosity_trait * 0.3 if understanding > 0.5 else 0.0
+
+def _score_initiate_conversation(psyche, drives, objects_in_room, needs, cortisol):
+    return _urgency(drives, 'connection') * 1.3 if psyche.somatic.has_possession("phone") else 0.0
+
+def _score_look_out_window(psyche, drives, objects_in_room, needs, cortisol):
+    return (1.0 - cortisol) * 0.5 if "window" in objects_in_room else 0.0
+
+_AUTONOMOUS_ACTIONS = (
+    ("paint", _score_paint, lambda psyche: PaintAction(psyche)),
+    ("read_a_book", _score_read, lambda psyche: psyche.conscious._read_a_book()),
+    ("eat", _score_eat, lambda psyche: psyche.conscious._plan_to_eat()),
+    ("sleep", _score_sleep, lambda psyche: psyche.conscious._generate_action_plan("Go to the 'Bedroom' and sleep.")),
+    ("journal", _score_journal, lambda psyche: psyche.conscious._think_about_journaling()),
+    ("explore_home", _score_explore_home, lambda psyche: psyche.conscious._explore_home_randomly()),
+    ("initiate_conversation", _score_initiate_conversation, lambda psyche: psyche.conscious._initiate_conversation()),
+    ("look_out_window", _score_look_out_window, lambda psyche: LookOutOfWindowAction(psyche)),
+)
+
 class Psyche:
 
     def __init__(self, unalterable_path="personality_unalterable.json", alterable_path="personality_alterable.json"):
         self.codex_path = "codex.json"
         self.world_path = "world_state.json"
         self.journal_path = "journal.txt"
+        self.transcripts_dir = "conversations"
+        self._pending_transcripts = {}  # user_id -> encoded JSONL lines not yet appended to the user's transcript
+        self._transcript_lock = threading.Lock()
+        self._journal_fh = None
+        self._journal_buf = bytearray()  # Encoded entries not yet written; reused for every flush.
+        self._last_journal_flush = 0.0
+        self._journal_lock = threading.Lock()  # Dreams are journaled from the subconscious's thread.
         self.body_path = "body.json"
+        self.blueprints_path = "blueprints.json"
+        self._blueprints = None  # Loaded on first use by get_blueprints.
         self.unalterable_path = unalterable_path
         self.alterable_path = alterable_path
-        self.model = genai.GenerativeModel('gemini-1.5-pro-latest')
-        self.message_queue = queue.Queue()
+        self._saved_json = {}  # Last bytes read or written per state file; unchanged files are skipped on save.
+        self.persona_version = 0
+        self._strongest_drive = None  # Name of the most urgent core drive, or None until it is next computed.
+        self._unsaved_changes = 0
+        self._dirty_files = set()
+        self._last_save = time.time()
+        self.model = get_shared_model()
+        self.message_queue = queue.SimpleQueue()  # Many producers, one consumer (the output thread); no task_done/join.
         self.system_command_queue = queue.Queue()
         self.state_lock = threading.Lock()
+        self._wake = threading.Event()
+        self.stop_event = threading.Event()  # Set when the process should wind down; the worker loops exit on it.
+        # Serialized state waiting for the writer thread, newest bytes per path; the disk writes happen outside state_lock.
+        self._pending_writes = {}
+        self._writes_ready = threading.Condition()
+        self._write_lock = threading.Lock()
+        threading.Thread(target=self._state_writer, daemon=True, name="StateWriter").start()
 
         self.somatic = SomaticProcessor(self)
         self.subconscious = SubconsciousMind(self)
@@ -88,8 +284,13 @@ class Psyche:
         self.is_rate_limited = False
         self.rate_limit_until = 0
         self.last_interaction_time = time.time()
+        self.tick_time = time.time()  # Wall-clock time of the current beat; read instead of calling time.time() mid-beat.
         self.last_user_id = "system"
-        self.last_personality_drift_check = datetime.now()
+        # Persisted so the weekly drift deadline carries over restarts instead of starting a fresh week each boot.
+        self.last_personality_drift_check = datetime.fromtimestamp(self.codex.get('last_personality_drift', time.time()))
+        # Min-heap of (due_time, task) for the slow periodic work, so each beat only peeks at the earliest one.
+        self._due_tasks = []
+        self.blueprint_cache = {}
 
 
     def _create_default_personality_files(self):
@@ -137,12 +338,16 @@ class Psyche:
                 {"type": "opinion", "statement": "My dreams seem to be connected to my strongest feelings from when I am awake."}
             ]
         }
-        with open(self.unalterable_path, 'w', encoding='utf-8') as f: json.dump(default_unalterable, f, indent=4)
-        with open(self.alterable_path, 'w', encoding='utf-8') as f: json.dump(default_alterable, f, indent=4)
+        for path, data in ((self.unalterable_path, default_unalterable), (self.alterable_path, default_alterable)):
+            encoded = fast_json.dumps_pretty(data)
+            fast_json.write_atomic(path, encoded)
+            self._saved_json[path] = encoded
+        return default_unalterable, default_alterable
 
     def _get_default_world_state(self):
         self.log_mind_event("SYSTEM_CREATE", "Creating a new world state from default template.")
         return {
+            "_schema_version": _WORLD_MIGRATIONS[-1][0],
             "home_coordinates": [[0,0,0], [0,-1,0], [-1,0,0]],
             "current_location_coords": [0, 0, 0],
             "time_of_day": "Afternoon",
@@ -181,89 +386,133 @@ class Psyche:
                 "easel": {"description": "A sturdy wooden easel, waiting for a canvas.", "inventory": ["blank_canvas"]},
                 "blank_canvas": {"description": "A blank canvas, full of possibility."}
             },
-            "known_action_blueprints": {},
-            "known_object_blueprints": {}
         }
 
     def _migrate_and_validate_state(self):
         migrated = False
-        default_world = self._get_default_world_state()
-
-        if 'home_coordinates' not in self.world_data:
-            self.world_data['home_coordinates'] = default_world['home_coordinates']
-            migrated = True
-        if 'grid' not in self.world_data or 'current_location_coords' not in self.world_data or not isinstance(self.world_data['current_location_coords'], list) or len(self.world_data['current_location_coords']) != 3:
+        coords = self.world_data.get('current_location_coords')
+        if 'grid' not in self.world_data or not isinstance(coords, (list, tuple)) or len(coords) != 3:
             self.log_mind_event("SYSTEM_MIGRATE", "Old world format detected. Migrating to 3D grid-based system.")
+            default_world = self._get_default_world_state()
             self.world_data['grid'] = default_world['grid']
             self.world_data['current_location_coords'] = default_world['current_location_coords']
             if 'objects' not in self.world_data: self.world_data['objects'] = default_world['objects']
+            self.request_save("world")
             migrated = True
-        if 'easel' not in self.world_data.get('objects', {}):
-             self.world_data.setdefault('objects', {})['easel'] = default_world['objects']['easel']
-             migrated = True
-        living_room_coords_str = "0,0,0"
-        if living_room_coords_str in self.world_data['grid'] and 'easel' not in self.world_data['grid'][living_room_coords_str].get('objects',[]):
-            self.world_data['grid'][living_room_coords_str].setdefault('objects', []).append('easel')
-            migrated = True
-        if 'known_action_blueprints' not in self.world_data:
-             self.world_data['known_action_blueprints'] = {}
-             migrated = True
-        if 'hunger' not in self.somatic.needs:
-            self.log_mind_event("SYSTEM_MIGRATE", "Somatic data outdated. Adding 'hunger' need.")
-            self.somatic.needs['hunger'] = 1.0
-            migrated = True
-        if 'skills' not in self.codex.get('cognitive_model', {}):
-             self.codex.setdefault('cognitive_model', {})['skills'] = {"art_skill": 0.0, "work_ethic": 0.0, "research_skill": 0.0, "painting_skill": 0.0}
-             migrated = True
-        if 'users' in self.codex.get('cognitive_model', {}):
-            for user_id, profile in self.codex['cognitive_model']['users'].items():
-                if 'promises_made' not in profile:
-                    profile['promises_made'] = []
+        # Each file records the last migration it has been through, so later boots skip straight past them.
+        # This runs mid-load, before __init__ has set everything save_state reads, so the files are only
+        # marked dirty here and the life loop writes them out.
+        for name, data, migrations in (("world", self.world_data, _WORLD_MIGRATIONS), ("codex", self.codex, _CODEX_MIGRATIONS)):
+            version = data.get('_schema_version', 0)
+            if version >= migrations[-1][0]:
+                continue
+            for migration_version, migrate in migrations:
+                if migration_version > version and migrate(self):
                     migrated = True
-        if "phone" in self.world_data.get("objects", {}) and "missed_notifications" in self.world_data["objects"]["phone"]:
-            self.log_mind_event("SYSTEM_MIGRATE", "Phone object outdated. Migrating 'missed_notifications' to 'unread_messages'.")
-            self.world_data["objects"]["phone"]["unread_messages"] = self.world_data["objects"]["phone"].pop("missed_notifications", [])
-            migrated = True
+            data['_schema_version'] = migrations[-1][0]
+            self.request_save(name)
         if migrated:
-            self.log_mind_event("SYSTEM_MIGRATE", "State migration complete. Saving updated files.")
-            self.save_state()
+            self.log_mind_event("SYSTEM_MIGRATE", "State migration complete. Updated files will be saved shortly.")
+
+    def _load_json(self, path):
+        """Parses a state file, remembering its bytes so an unchanged file isn't rewritten on the next save."""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        data = fast_json.loads(raw)
+        self._saved_json[path] = raw
+        return data
 
     def _load_state(self):
         try:
-            with open(self.codex_path, 'r', encoding='utf-8') as f: self.codex = json.load(f)
+            self.codex = self._load_json(self.codex_path)
         except (FileNotFoundError, json.JSONDecodeError):
             self.log_mind_event("SYSTEM_CREATE", f"{self.codex_path} not found or invalid. Creating new codex.")
             self.codex = {}
         try:
-            with open(self.world_path, 'r', encoding='utf-8') as f: self.world_data = json.load(f)
+            self.world_data = self._load_json(self.world_path)
         except (FileNotFoundError, json.JSONDecodeError):
             self.log_mind_event("SYSTEM_CREATE", f"{self.world_path} not found or invalid. Creating new world.")
             self.world_data = self._get_default_world_state()
+        if any(key in self.world_data for key in BLUEPRINT_KEYS):
+            # Older saves kept research blueprints inside the world file; move them to their own.
+            blueprints = self.get_blueprints()
+            for key in BLUEPRINT_KEYS:
+                blueprints[key].update(self.world_data.pop(key, None) or {})
+            self.request_save("world", "blueprints")
         try:
-            with open(self.body_path, 'r', encoding='utf-8') as f: self.body_schema = json.load(f)
+            self.body_schema = self._load_json(self.body_path)
         except (FileNotFoundError, json.JSONDecodeError):
             self.log_mind_event("SYSTEM_CREATE", f"{self.body_path} not found or invalid. Creating new body schema.")
             self.body_schema = {"state": "healthy", "hands_free": 2, "carrying_capacity": 3, "possessions": [], "hair_color": "soft pink"}
         try:
-            with open(self.alterable_path, 'r', encoding='utf-8') as f: self.alterable_persona = json.load(f)
+            self.alterable_persona = self._load_json(self.alterable_path)
         except (FileNotFoundError, json.JSONDecodeError):
-            self._create_default_personality_files()
-            with open(self.alterable_path, 'r', encoding='utf-8') as f: self.alterable_persona = json.load(f)
+            _, self.alterable_persona = self._create_default_personality_files()
         try:
-            with open(self.unalterable_path, 'r', encoding='utf-8') as f: self.unalterable_persona = json.load(f)
+            self.unalterable_persona = self._load_json(self.unalterable_path)
         except (FileNotFoundError, json.JSONDecodeError):
-            self._create_default_personality_files()
-            with open(self.unalterable_path, 'r', encoding='utf-8') as f: self.unalterable_persona = json.load(f)
+            self.unalterable_persona, _ = self._create_default_personality_files()
 
         self.identity = self.alterable_persona.get('identity', {"name": "Jessica"})
         self.cognitive_model = self.alterable_persona
+        for user_id, profile in self.alterable_persona.get('users', {}).items():
+            # Older saves may predate some fields; fill them in once here so readers can rely on the schema.
+            for key, value in new_user_profile(user_id).items():
+                profile.setdefault(key, value)
+            profile['conversation_log'] = deque(profile['conversation_log'], maxlen=CONVERSATION_LOG_LIMIT)
+            profile['shared_memories'] = deque(profile['shared_memories'], maxlen=MEMORY_LIMIT)
+            profile['inside_jokes'] = deque(profile['inside_jokes'], maxlen=MEMORY_LIMIT)
+        self._intern_names()
         self.genetic_code = self.unalterable_persona.get("genetic_code", {})
         somatic_state = self.codex.get('somatic_state', {})
-        self.somatic.possessions = self.body_schema.get('possessions', [])
+        self.somatic.set_possessions(self.body_schema.get('possessions', []))
         self.somatic.needs = somatic_state.get('needs', {'energy': 1.0, 'hunger': 1.0, 'money': 0.0})
         self.somatic.psychological_state = somatic_state.get('psychological_state', "Stable")
         self._migrate_and_validate_state()
+        self.world_data['current_location_coords'] = tuple(self.world_data['current_location_coords'])
         self.current_mission = self.codex.get('current_mission', None)
+        self._index_promises()
+
+    def get_blueprints(self):
+        """
+        The object and action blueprints learned through research. They are only written to, so they
+        live in their own file that isn't read or re-serialized with the world until research needs it.
+        """
+        if self._blueprints is None:
+            try:
+                self._blueprints = self._load_json(self.blueprints_path)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._blueprints = {}
+            for key in BLUEPRINT_KEYS:
+                self._blueprints.setdefault(key, {})
+        return self._blueprints
+
+    def _intern_names(self):
+        """
+        Interns object names and user ids from the freshly parsed state. They are compared constantly
+        (room contents, possessions, profiles) and otherwise every copy is a separate string.
+        """
+        objects = self.world_data.get('objects')
+        if objects:
+            self.world_data['objects'] = {sys.intern(name): obj for name, obj in objects.items()}
+        for room in self.world_data.get('grid', {}).values():
+            if room.get('objects'):
+                room['objects'] = [sys.intern(name) for name in room['objects']]
+        if self.body_schema.get('possessions'):
+            self.body_schema['possessions'] = [sys.intern(name) for name in self.body_schema['possessions']]
+        users = self.alterable_persona.get('users')
+        if users:
+            self.alterable_persona['users'] = {sys.intern(user_id): profile for user_id, profile in users.items()}
+
+    def _index_promises(self):
+        """Groups unkept promises by date so the scheduled-event check only looks at today's.
+        Built once at load; a promise added to a profile later is not seen until this runs again."""
+        self._promises_by_date = {}
+        for user_id, profile in self.alterable_persona.get('users', {}).items():
+            if user_id == "system": continue
+            for promise in profile.get('promises_made', []):
+                if promise.get('date') and not promise.get('fulfilled', False):
+                    self._promises_by_date.setdefault(promise['date'], []).append((user_id, promise))
 
     @property
     def is_asleep(self):
@@ -271,14 +520,65 @@ class Psyche:
 
     def log_mind_event(self, event_type, message):
         event_type = event_type.upper()
-        if event_type in ["CRITICAL", "FATAL", "FAILURE"]:
-            log.error(f"[{event_type}] - {message}")
-        elif event_type in ["ERROR", "WARNING"]:
-            log.warning(f"[{event_type}] - {message}")
+        if event_type in ("CRITICAL", "FATAL", "FAILURE"):
+            log.error("[%s] - %s", event_type, message)
+        elif event_type in ("ERROR", "WARNING"):
+            log.warning("[%s] - %s", event_type, message)
         else:
-            log.info(f"[{event_type}] - {message}")
-
-    def save_state(self):
+            log.info("[%s] - %s", event_type, message)
+
+    def drive_urgency(self, name, default=0.0):
+        return self.alterable_persona.get('core_drives', {}).get(name, {}).get('urgency', default)
+
+    def set_drive_urgency(self, name, urgency):
+        """Sets a core drive's urgency, adding the drive if this persona predates it."""
+        drive = self.alterable_persona.setdefault('core_drives', {}).setdefault(name, {})
+        previous = drive.get('urgency', 0.0)
+        drive['urgency'] = urgency
+        if name == self._strongest_drive:
+            if urgency < previous:
+                self._strongest_drive = None  # Another drive may lead now; rescan on the next read.
+        else:
+            self.note_drive_raised(name, urgency)
+
+    def note_drive_raised(self, name, urgency):
+        """Keeps the cached strongest drive current after `name`'s urgency went up to `urgency`."""
+        strongest = self._strongest_drive
+        if strongest is not None and name != strongest and urgency > self.drive_urgency(strongest):
+            self._strongest_drive = name
+
+    def strongest_drive(self, default=None):
+        """The most urgent core drive's name. Kept up to date by the urgency writers, so this rarely scans."""
+        if self._strongest_drive is None:
+            drives = self.alterable_persona.get('core_drives', {})
+            self._strongest_drive = max(drives, key=lambda name: drives[name].get('urgency', 0), default=None)
+        return self._strongest_drive or default
+
+    def mark_persona_changed(self):
+        """Invalidates cached renderings of the alterable persona."""
+        self.persona_version += 1
+
+    def request_save(self, *files):
+        """
+        Marks state files ("codex", "world", "body", "persona") as changed, or all of them if none are named.
+        The life loop writes the dirty ones out in batches via _maybe_save.
+        """
+        files = files or STATE_FILES
+        if "persona" in files:
+            self.mark_persona_changed()
+        self._dirty_files.update(files)
+        self._unsaved_changes += 1
+
+    def _maybe_save(self, now):
+        if self._unsaved_changes and (self._unsaved_changes >= SAVE_BATCH_SIZE or now - self._last_save >= SAVE_INTERVAL):
+            self.save_state(self._dirty_files)
+
+    def save_state(self, files=STATE_FILES):
+        """Writes the named state files (all of them by default); untouched files are not re-serialized."""
+        files = set(files)
+        self._dirty_files.difference_update(files)
+        self._unsaved_changes = 0
+        self._last_save = time.time()
         with self.state_lock:
             self.codex['identity'] = self.identity
             # Ensure the 'users' dict is preserved during save
@@ -286,29 +586,119 @@ class Psyche:
             self.body_schema['possessions'] = self.somatic.possessions
             self.codex['somatic_state'] = {'needs': self.somatic.needs, 'psychological_state': self.somatic.psychological_state}
             self.codex['current_mission'] = self.current_mission
-            with open(self.codex_path, 'w', encoding='utf-8') as f: json.dump(self.codex, f, indent=4)
-            with open(self.world_path, 'w', encoding='utf-8') as f: json.dump(self.world_data, f, indent=4)
-            with open(self.body_path, 'w', encoding='utf-8') as f: json.dump(self.body_schema, f, indent=4)
-            with open(self.alterable_path, 'w', encoding='utf-8') as f: json.dump(self.alterable_persona, f, indent=4)
+            self.codex['last_personality_drift'] = self.last_personality_drift_check.timestamp()
+            targets = {"codex": (self.codex_path, self.codex), "world": (self.world_path, self.world_data),
+                       "body": (self.body_path, self.body_schema), "persona": (self.alterable_path, self.alterable_persona),
+                       "blueprints": (self.blueprints_path, self._blueprints)}
+            changed = {}
+            for name in files:
+                path, data = targets[name]
+                if data is None: continue
+                encoded = fast_json.dumps_pretty(data)
+                if self._saved_json.get(path) != encoded:
+                    changed[path] = encoded
+                    self._saved_json[path] = encoded
+        if changed:
+            with self._writes_ready:
+                self._pending_writes.update(changed)
+                self._writes_ready.notify()
+        self.flush_journal()
         self.log_mind_event("SYSTEM", "State, world, body, and personas saved.")
 
+    def _state_writer(self):
+        while True:
+            with self._writes_ready:
+                while not self._pending_writes:
+                    self._writes_ready.wait()
+            self.flush_state_writes()
+
+    def flush_state_writes(self):
+        """Writes any serialized state still waiting for the writer thread. Returns once it is on disk."""
+        # Taking the batch under _write_lock keeps an older batch from landing after a newer one.
+        with self._write_lock:
+            with self._writes_ready:
+                batch, self._pending_writes = self._pending_writes, {}
+            for path, encoded in batch.items():
+                try:
+                    fast_json.write_atomic(path, encoded)
+                except OSError as e:
+                    self.log_mind_event("ERROR", f"Failed to write {path}: {e}")
+                    self._saved_json.pop(path, None)
+                    self._mark_unwritten(path)
+
+    def _mark_unwritten(self, path):
+        """Re-marks the state file behind `path` dirty after a failed write, so the next _maybe_save retries it."""
+        names = {self.codex_path: "codex", self.world_path: "world", self.body_path: "body",
+                 self.alterable_path: "persona", self.blueprints_path: "blueprints"}
+        name = names.get(path)
+        if name is not None:
+            self._dirty_files.add(name)
+            self._unsaved_changes += 1
+
+    def append_to_journal(self, text):
+        # Entries collect in one reused buffer. It is written out at once if it grows large, and otherwise by the
+        # life loop's _maybe_flush_journal within about a second, so a quiet spell after a burst doesn't strand it.
+        with self._journal_lock:
+            self._journal_buf += text.encode('utf-8')
+            if len(self._journal_buf) < JOURNAL_BUFFER_BYTES:
+                return
+        self._write_journal_buffer()
+
+    def _maybe_flush_journal(self, now):
+        if self._journal_buf and now - self._last_journal_flush >= JOURNAL_FLUSH_INTERVAL:
+            self._write_journal_buffer()
+
+    def _write_journal_buffer(self):
+        with self._journal_lock:
+            if self._journal_buf:
+                if self._journal_fh is None:
+                    self._journal_fh = open(self.journal_path, 'ab', buffering=0)
+                self._journal_fh.write(self._journal_buf)
+                self._journal_buf.clear()
+            self._last_journal_flush = time.time()
+
+    def flush_journal(self):
+        self._write_journal_buffer()
+        self._flush_transcripts()
+
+    def record_conversation(self, user_id, entries):
+        """
+        Adds lines to the user's recent conversation_log and queues them for their append-only transcript,
+        which keeps the full history without it being re-serialized with the persona on every save.
+        """
+        self.get_or_create_user(user_id)['conversation_log'].extend(entries)
+        now = time.time()
+        lines = [(fast_json.dumps({"timestamp": now, "entry": entry}) + "\n").encode('utf-8') for entry in entries]
+        with self._transcript_lock:
+            self._pending_transcripts.setdefault(user_id, []).extend(lines)
+
+    def _flush_transcripts(self):
+        with self._transcript_lock:
+            pending, self._pending_transcripts = self._pending_transcripts, {}
+        if not pending: return
+        os.makedirs(self.transcripts_dir, exist_ok=True)
+        for user_id, lines in pending.items():
+            path = os.path.join(self.transcripts_dir, _UNSAFE_FILENAME_RE.sub('_', user_id) + ".jsonl")
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    if hasattr(os, 'writev'):
+                        for start in range(0, len(lines), 1024):  # IOV_MAX on Linux
+                            os.writev(fd, lines[start:start + 1024])
+                    else:
+                        os.write(fd, b"".join(lines))
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                self.log_mind_event("ERROR", f"Failed to append to transcript {path}: {e}")
+
     def get_or_create_user(self, user_id):
         # User profiles are now stored within the alterable persona
         users = self.alterable_persona.setdefault('users', {})
         if user_id not in users:
             self.log_mind_event("IDENTITY", f"First contact with new entity '{user_id}'. Creating profile with neutral sentiment.")
-            users[user_id] = {
-                "name": user_id,
-                "emotions": {"rapport": 0.5, "trust": 0.5, "annoyance": 0.0},
-                "known_facts": {},
-                "judgements": [],
-                "shared_memories": [],
-                "inside_jokes": [],
-                "promises_made": [],
-                "conversation_log": [],
-                "last_interaction_time": time.time(),
-                "is_creator": False
-            }
+            user_id = sys.intern(user_id)
+            users[user_id] = new_user_profile(user_id)
         return users[user_id]
 
     def perceive_user_event(self, user_id, messages_content):
@@ -320,7 +710,7 @@ class Psyche:
             new_messages.append({"user_id": user_id, "content": content, "timestamp": time.time()})
         phone_obj.setdefault("unread_messages", []).extend(new_messages)
         self.get_or_create_user(user_id)["last_interaction_time"] = time.time()
-        if "phone" in self.somatic.possessions:
+        if self.somatic.has_possession("phone"):
             user_name = self.conscious.get_user_name(user_id)
             self.log_mind_event("PERCEPTION", f"The screen lights up with {len(new_messages)} new notification(s) from '{user_name}'. Reading them now.")
             if self.action_plan:
@@ -331,15 +721,18 @@ class Psyche:
         else:
             self.log_mind_event("PERCEPTION", f"Heard a notification chime. It's from '{self.conscious.get_user_name(user_id)}'.")
             self.conscious._send_narration("*A notification chime sounds from her phone nearby.*")
+        self.wake()
 
 # =======================================================================================
 # == Autonomous Action and Spontaneous Thought Logic
 # =======================================================================================
 
     def _consider_autonomous_action(self):
-        if self.action_manager.is_busy() or self.action_plan or self.current_mission: return
+        # Only choose something new when nothing is running or queued, so a re-pick can't stack behind itself.
+        if not self.action_manager.is_idle() or self.action_plan or self.current_mission: return
         drives = self.alterable_persona.get('core_drives', {})
         current_loc_data = self.world_manager.get_current_location_data()
+        if not current_loc_data: return
         objects_in_room = current_loc_data.get("objects", [])
         unread_messages = self.world_data.get("objects", {}).get("phone", {}).get("unread_messages", [])
         if "phone" in objects_in_room and unread_messages:
@@ -348,29 +741,18 @@ class Psyche:
             if isinstance(action_result, Action):
                 self.action_manager.start_action(action_result)
             return
-        if (time.time() - self.last_interaction_time) < 120: return
-        possible_actions = [
-            {"name": "paint", "action": lambda: PaintAction(self), "preconditions": [lambda: "easel" in objects_in_room],"desire_score": lambda: drives.get('creativity', {}).get('urgency', 0.0) * 1.5 + (1.0 - self.limbic.cortisol) * 0.5},
-            {"name": "read_a_book", "action": self.conscious._read_a_book, "preconditions": [lambda: "bookshelf" in objects_in_room],"desire_score": lambda: drives.get('understanding', {}).get('urgency', 0.0) * 1.2},
-            {"name": "eat", "action": self.conscious._plan_to_eat, "preconditions": [lambda: self.somatic.needs.get('hunger', 1.0) < 0.5],"desire_score": lambda: (1.0 - self.somatic.needs.get('hunger', 1.0)) * 2.0},
-            {"name": "sleep", "action": lambda: self.conscious._generate_action_plan("Go to the 'Bedroom' and sleep."), "preconditions": [lambda: self.somatic.needs.get('energy', 1.0) < 0.3],"desire_score": lambda: (1.0 - self.somatic.needs.get('energy', 1.0)) * 1.8},
-            {"name": "journal", "action": self.conscious._think_about_journaling, "preconditions": [lambda: self.limbic.cortisol > 0.6 or self.limbic.dopamine > 0.8 or (random.random() < 0.1)],"desire_score": lambda: (self.limbic.cortisol - 0.5) + (drives.get('understanding',{}).get('urgency') * 0.5)},
-            {"name": "explore_home", "action": self.conscious._explore_home_randomly, "preconditions": [lambda: drives.get('understanding', {}).get('urgency', 0.0) > 0.5],"desire_score": lambda: drives.get('understanding', {}).get('urgency', 0.0) * self.limbic.curiosity_trait * 0.3},
-            {"name": "initiate_conversation", "action": self.conscious._initiate_conversation, "preconditions": [lambda: "phone" in self.somatic.possessions],"desire_score": lambda: drives.get('connection', {}).get('urgency', 0.0) * 1.3},
-            {"name": "look_out_window", "action": lambda: LookOutOfWindowAction(self), "preconditions": [lambda: "window" in objects_in_room],"desire_score": lambda: (1.0 - self.limbic.cortisol) * 0.5}
-        ]
-        valid_actions = []
-        for a in possible_actions:
-            if all(p() for p in a["preconditions"]):
-                score = a["desire_score"]()
-                if score > 0:
-                    valid_actions.append({"name": a["name"], "action": a["action"], "score": score})
-        if not valid_actions: return
-        chosen_action = max(valid_actions, key=lambda x: x['score'])
+        if (self.tick_time - self.last_interaction_time) < 120: return
+        needs = self.somatic.needs
+        cortisol = self.limbic.cortisol
+        best_name, best_score, best_start = None, 0.0, None
+        for name, score_fn, start in _AUTONOMOUS_ACTIONS:
+            score = score_fn(self, drives, objects_in_room, needs, cortisol)
+            if score > best_score:
+                best_name, best_score, best_start = name, score, start
         autonomy_threshold = 0.5
-        if chosen_action['score'] > autonomy_threshold:
-            self.log_mind_event("AUTONOMY", f"High desire for action '{chosen_action['name']}' (Score: {chosen_action['score']:.2f} > Threshold: {autonomy_threshold:.2f}). Initiating action.")
-            action_result = chosen_action['action']()
+        if best_score > autonomy_threshold:
+            self.log_mind_event("AUTONOMY", f"High desire for action '{best_name}' (Score: {best_score:.2f} > Threshold: {autonomy_threshold:.2f}). Initiating action.")
+            action_result = best_start(self)
             if isinstance(action_result, Action):
                 self.action_manager.start_action(action_result)
 
@@ -378,6 +760,7 @@ class Psyche:
         if self.action_manager.is_busy() or self.action_plan: return
         if random.random() > 0.05: return
         current_loc_data = self.world_manager.get_current_location_data()
+        if not current_loc_data: return
         objects_in_room = current_loc_data.get("objects", [])
         triggers = []
         if self.world_data.get('weather') in ["Rainy", "Stormy"]: triggers.append("The sound of the rain is making me thoughtful.")
@@ -393,17 +776,15 @@ class Psyche:
 
     def _check_for_scheduled_events(self):
         if self.action_manager.is_busy() or self.action_plan: return
-        today_str = date.today().isoformat()
-        users = self.alterable_persona.get('users', {})
-        for user_id, profile in users.items():
-            if user_id == "system": continue
-            promises_to_keep = [p for p in profile.get('promises_made', []) if p.get('date') == today_str and not p.get('fulfilled', False)]
-            for event in promises_to_keep:
-                user_name = profile.get('name', user_id)
-                self.log_mind_event("PROACTIVE_EVENT", f"Remembered a promise to '{user_name}' about '{event['event']}'.")
-                thought = f"I remember I promised to check in with {user_name} about their '{event['event']}' today. I should ask them about it."
-                self.conscious.think(f"PROACTIVE: {thought}", user_id, thought)
-                event['fulfilled'] = True
+        due = self._promises_by_date.pop(date.today().isoformat(), None)
+        if not due: return
+        for user_id, event in due:
+            if event.get('fulfilled', False): continue
+            user_name = self.conscious.get_user_name(user_id)
+            self.log_mind_event("PROACTIVE_EVENT", f"Remembered a promise to '{user_name}' about '{event['event']}'.")
+            thought = f"I remember I promised to check in with {user_name} about their '{event['event']}' today. I should ask them about it."
+            self.conscious.think(f"PROACTIVE: {thought}", user_id, thought)
+            event['fulfilled'] = True
 
 # =======================================================================================
 # == Action Plan Execution Logic
@@ -423,17 +804,14 @@ class Psyche:
             )
             return
 
-        if self.action_plan and not self.action_manager.is_busy():
+        # One step at a time: the next starts only once the last has finished, so a failure can still abort the rest.
+        if self.action_plan and self.action_manager.is_idle():
             self.action_manager.last_action_status = None
             step = self.action_plan.pop(0)
-            self.log_mind_event("ACTION_PLAN", f"Executing next step: '{step['action']}' with data {step.get('action_data', {})}. {len(self.action_plan)} steps remaining.")
-            action_name = step['action']
-            action_data = step.get('action_data', {})
-            action_to_start = None
-
-            if action_name in self.conscious.action_factory:
-                action_factory_method = self.conscious.action_factory[action_name]
-                action_to_start = action_factory_method("system_plan", action_data)
+            self.log_mind_event("ACTION_PLAN", f"Executing next step: '{step.action}' with data {step.data}. {len(self.action_plan)} steps remaining.")
+            action_name = step.action
+            action_factory_method = self.conscious.action_factory.get(action_name)
+            action_to_start = action_factory_method("system_plan", step.data) if action_factory_method else None
             
             if isinstance(action_to_start, Action):
                 self.action_manager.start_action(action_to_start)
@@ -482,11 +860,51 @@ class Psyche:
 # == Main Life Cycle and Shutdown
 # =======================================================================================
 
+    def _schedule(self, due_time, task):
+        heapq.heappush(self._due_tasks, (due_time, task))
+
+    def _run_due_tasks(self, now):
+        while self._due_tasks and self._due_tasks[0][0] <= now:
+            _, task = heapq.heappop(self._due_tasks)
+            if task == "consolidate":
+                if self.is_sleeping and self.subconscious.should_dream():
+                    self.subconscious.dream()
+                self.subconscious.consolidate_all_memories_into_lessons()
+                self._schedule(now - now % 3600 + 3600, "consolidate")
+            elif task == "drift":
+                self.subconscious.perform_personality_drift()
+                self.last_personality_drift_check = datetime.fromtimestamp(now)
+                self.request_save("codex")
+                self._schedule(now + DRIFT_INTERVAL, "drift")
+
+    def wake(self):
+        """Wakes the life loop early so an outside event is acted on without waiting for the next beat."""
+        self._wake.set()
+
+    def stop(self):
+        """Asks the life loop and the I/O threads to finish; shutdown() then saves state."""
+        self.stop_event.set()
+        self._wake.set()
+        self.message_queue.put(None)  # Wakes the output thread, which exits once it has written what came before.
+
     def live(self):
-        while True:
+        now = time.time()
+        self._schedule(now - now % 3600 + 3600, "consolidate")
+        self._schedule(self.last_personality_drift_check.timestamp() + DRIFT_INTERVAL, "drift")
+        next_beat = now + BEAT_INTERVAL
+        while not self.stop_event.is_set():
             try:
-                time.sleep(1)
-                self.log_mind_event("LIFECYCLE", f"Beat @ {datetime.now().isoformat()}. Current Action: {self.action_manager.get_current_action().__class__.__name__}")
+                self._wake.wait(max(0.0, next_beat - time.time()))
+                self._wake.clear()
+                if self.stop_event.is_set(): break
+                now = self.tick_time = time.time()
+                if now < next_beat:
+                    # Woken early: pick up whatever follows an action that has just finished. Nothing ticks until the next beat.
+                    self.action_manager.handle_finished()
+                    continue
+                next_beat = max(next_beat + BEAT_INTERVAL, now)
+                if log.isEnabledFor(logging.INFO):
+                    self.log_mind_event("LIFECYCLE", f"Beat @ {datetime.fromtimestamp(now).isoformat()}. Current Action: {self.action_manager.get_current_action().__class__.__name__}")
                 self.somatic.update()
                 self.limbic.update(self)
                 self.world_manager.update()
@@ -496,60 +914,93 @@ class Psyche:
                     self._execute_next_plan_step()
                 elif self.current_mission:
                     self._execute_mission_step()
-                elif not self.action_manager.is_busy():
-                    self._check_for_scheduled_events()
-                    self._consider_autonomous_action()
-                    self._consider_spontaneous_thought()
-
-                if (datetime.now() - self.last_personality_drift_check).days >= 7:
-                    self.subconscious.perform_personality_drift()
-                    self.last_personality_drift_check = datetime.now()
-                if time.time() % 3600 < 5:
-                    if self.is_sleeping and self.subconscious.should_dream():
-                        self.subconscious.dream()
-                    self.subconscious.consolidate_all_memories_into_lessons()
+                # Otherwise IdleAction.update (ticked above) runs the idle deliberation checks on its own cadence.
+
+                self._run_due_tasks(now)
+                self._maybe_save(now)
+                self._maybe_flush_journal(now)
             except Exception as e:
                 self.log_mind_event("CRITICAL", f"Live thread encountered a fatal error: {e}")
+                self.stop_event.set()
                 break
 
     def shutdown(self):
         self.log_mind_event("SYSTEM", "Shutdown sequence initiated.")
         self.save_state()
+        self.flush_state_writes()
+        if self._journal_fh is not None:
+            self._journal_fh.close()
+            self._journal_fh = None
         self.log_mind_event("SYSTEM", "State saved. Mind is now offline.")
 
 # =======================================================================================
 # == Somatic Processor (Needs & Physical State)
 # =======================================================================================
 
+# Per-beat urgency growth while awake: (drive, urgency if unset, increment).
+_DRIVE_GROWTH = (('understanding', 0.8, 0.00033), ('connection', 0.6, 0.00067), ('creativity', 0.4, 0.001))
+# Per-beat need changes.
+_ENERGY_DECAY = 0.00133
+_ENERGY_DECAY_STRESSED = _ENERGY_DECAY * 1.5
+_HUNGER_DECAY = 0.00067
+_HUNGER_DECAY_ASLEEP = _HUNGER_DECAY / 2.0
+_ENERGY_RECOVERY_ASLEEP = 0.0167
+
 class SomaticProcessor:
     def __init__(self, psyche):
         self.psyche = psyche
         self.needs = {}
         self.possessions = []
+        self._possession_counts = Counter()
         self.psychological_state = "Stable"
+        self._mood_title = (None, None)  # (primary mood, its title-cased form); the mood rarely changes between beats.
+
+    def set_possessions(self, items):
+        self.possessions = items
+        self._possession_counts = Counter(items)
+
+    def has_possession(self, item):
+        return self._possession_counts[item] > 0
+
+    def add_possession(self, item):
+        self.possessions.append(item)
+        self._possession_counts[item] += 1
+
+    def remove_possession(self, item):
+        self.possessions.remove(item)
+        self._possession_counts[item] -= 1
+        if self._possession_counts[item] <= 0:
+            del self._possession_counts[item]
 
     def update(self):
         if self.psyche.state_lock.locked(): return
-        base_energy_decay = 0.00133
-        base_hunger_decay = 0.00067
-        drives = self.psyche.alterable_persona.get('core_drives', {})
-        if self.psyche.limbic.cortisol > 0.7: base_energy_decay *= 1.5
+        needs = self.needs
         if not self.psyche.is_sleeping:
-            self.needs['energy'] = max(0.0, self.needs.get('energy', 1.0) - base_energy_decay)
-            self.needs['hunger'] = max(0.0, self.needs.get('hunger', 1.0) - base_hunger_decay)
+            energy_decay = _ENERGY_DECAY_STRESSED if self.psyche.limbic.cortisol > 0.7 else _ENERGY_DECAY
+            energy = needs['energy'] = max(0.0, needs.get('energy', 1.0) - energy_decay)
+            hunger = needs['hunger'] = max(0.0, needs.get('hunger', 1.0) - _HUNGER_DECAY)
+            drives = self.psyche.alterable_persona.get('core_drives')
             if drives:
-                drives.get('understanding', {})['urgency'] = min(1.0, drives.get('understanding', {}).get('urgency', 0.8) + 0.00033)
-                drives.get('connection', {})['urgency'] = min(1.0, drives.get('connection', {}).get('urgency', 0.6) + 0.00067)
-                drives.get('creativity', {})['urgency'] = min(1.0, drives.get('creativity', {}).get('urgency', 0.4) + 0.001)
-            if "luminous_succulent" in self.psyche.world_data.get("objects", {}):
-                self.psyche.world_data['objects']['luminous_succulent']['health'] = max(0.0, self.psyche.world_data['objects']['luminous_succulent']['health'] - 0.00067)
+                for name, default, growth in _DRIVE_GROWTH:
+                    drive = drives.get(name)
+                    if drive is not None:
+                        urgency = drive.get('urgency', default)
+                        if urgency < 1.0:  # Saturated drives are left alone.
+                            urgency = drive['urgency'] = min(1.0, urgency + growth)
+                            self.psyche.note_drive_raised(name, urgency)
+            succulent = self.psyche.world_data.get("objects", {}).get("luminous_succulent")
+            if succulent is not None:
+                succulent['health'] = max(0.0, succulent['health'] - 0.00067)
         else:
-            self.needs['energy'] = min(1.0, self.needs.get('energy', 0.0) + 0.0167)
-            self.needs['hunger'] = max(0.0, self.needs.get('hunger', 1.0) - (base_hunger_decay / 2.0))
-        primary_mood = self.psyche.limbic.mood_profile["primary"]
-        if self.needs.get('hunger', 1.0) < 0.2: self.psychological_state = "Famished"
-        elif self.needs.get('energy', 1.0) < 0.2: self.psychological_state = "Exhausted"
-        else: self.psychological_state = primary_mood.title()
+            energy = needs['energy'] = min(1.0, needs.get('energy', 0.0) + _ENERGY_RECOVERY_ASLEEP)
+            hunger = needs['hunger'] = max(0.0, needs.get('hunger', 1.0) - _HUNGER_DECAY_ASLEEP)
+        if hunger < 0.2: self.psychological_state = "Famished"
+        elif energy < 0.2: self.psychological_state = "Exhausted"
+        else:
+            primary_mood = self.psyche.limbic.mood_profile["primary"]
+            if self._mood_title[0] != primary_mood:
+                self._mood_title = (primary_mood, primary_mood.title())
+            self.psychological_state = self._mood_title[1]
 
 # =======================================================================================
 # == Subconscious Mind (Memory, Dreams, Personality Drift)
@@ -558,6 +1009,8 @@ class SomaticProcessor:
 class SubconsciousMind:
     def __init__(self, psyche):
         self.psyche = psyche
+        self._last_dream_material = None
+        self._failed_consolidations = {}  # user_id -> (length, last line) of a log whose consolidation call failed
 
     def should_dream(self):
         return self.psyche.is_sleeping and random.random() < 0.25
@@ -569,84 +1022,103 @@ class SubconsciousMind:
             if profile.get('shared_memories'):
                 user_name = profile.get('name', user_id)
                 dream_material.append(f"My recent memory with {user_name}: {profile['shared_memories'][-1]}")
-        strongest_drive = max(self.psyche.alterable_persona.get('core_drives', {}).items(), key=lambda item: item[1].get('urgency', 0))
-        dream_material.append(f"My strongest feeling is a need for {strongest_drive[0]}")
+        strongest_drive = self.psyche.strongest_drive()
+        if strongest_drive:
+            dream_material.append(f"My strongest feeling is a need for {strongest_drive}")
         dream_material.append(f"My primary emotion right now is {self.psyche.limbic.mood_profile['primary']}")
+        if dream_material == self._last_dream_material:
+            # Nothing new to dream about since last time; don't spend a model call on a rerun.
+            self.psyche.log_mind_event("DREAM_SKIPPED", "No new memories or feelings to dream about.")
+            return
+        self._last_dream_material = dream_material
         dream_context = " and ".join(dream_material)
         dream_prompt = f"I am dreaming. My mind is filled with thoughts about {dream_context}. Weave these elements into a short, surreal dream sequence and write it to my journal."
         dream_text = self.psyche.conscious._safe_generate_content(dream_prompt)
         if dream_text:
-            with open(self.psyche.journal_path, 'a', encoding='utf-8') as f: f.write(f"\n--- Dream on {datetime.now().isoformat()} ---\n{dream_text}\n")
+            self.psyche.append_to_journal("".join(("\n--- Dream on ", _journal_timestamp(), " ---\n", dream_text, "\n")))
             self.psyche.log_mind_event("DREAM", "A new dream was recorded in the journal.")
 
     def consolidate_all_memories_into_lessons(self):
         self.psyche.log_mind_event("CONSOLIDATION", "Beginning conversation memory consolidation cycle.")
         users = self.psyche.alterable_persona.get('users', {})
-        for user_id, profile in users.items():
-            log_key = 'conversation_log'
-            if log_key in profile and len(profile.get(log_key, [])) > 5:
-                user_name = profile.get('name', user_id)
-                full_conversation = "\n".join(profile[log_key])
-                self.psyche.log_mind_event("CONSOLIDATION", f"Consolidating memory for user '{user_name}'.")
-                self._consolidate_facts_from_log(user_id, full_conversation)
-                consolidation_prompt = f"""
-                I am reflecting on my recent conversation with '{user_name}'. Here is the transcript:
-                ---
-                {full_conversation}
-                ---
-                Analyze this exchange. Synthesize it into a core `shared_memory`. Identify any potential `inside_jokes` (a specific phrase that was funny or meaningful).
-                Format the output as a JSON object.
-                ```json
-                {{
-                  "shared_memory": "A concise summary of the conversation's main topic and emotional tone.",
-                  "inside_jokes": ["A list of specific phrases that became inside jokes."]
-                }}
-                ```
-                """
-                raw_response = self.psyche.conscious._safe_generate_content(consolidation_prompt)
-                match = re.search(r'\{.*\}', raw_response, re.DOTALL)
-                if match:
-                    try:
-                        data = json.loads(match.group(), strict=False)
-                        if data.get("shared_memory"):
-                            profile.setdefault('shared_memories', []).append(data['shared_memory'])
-                            self.psyche.log_mind_event("CONSOLIDATION", f"New shared memory for '{user_name}': {data['shared_memory']}")
-                        if data.get("inside_jokes"):
-                            profile.setdefault('inside_jokes', []).extend(data['inside_jokes'])
-                    except json.JSONDecodeError:
-                        self.psyche.log_mind_event("ERROR", "Failed to decode consolidation JSON.")
-                profile[log_key][:] = []
-
-    def _consolidate_facts_from_log(self, user_id, conversation):
-        user_profile = self.psyche.get_or_create_user(user_id)
-        user_name = user_profile.get('name', user_id)
-        fact_prompt = f"""
-        Scan the following conversation with '{user_name}'. Extract any direct, objective, factual statements that '{user_name}' makes about themselves.
-        Examples: "I work as a...", "I like...", "my favorite color is...". Do not infer. Only extract direct statements.
-        Format as a JSON object where the key is the fact type and the value is the fact. If no new facts, return empty JSON.
-        Conversation:
+        pending = []
+        for user_id, profile in list(users.items()):
+            conversation_log = profile.get('conversation_log')
+            if conversation_log and len(conversation_log) > 5:
+                if self._failed_consolidations.get(user_id) == (len(conversation_log), conversation_log[-1]):
+                    continue  # Same transcript that failed last time; wait for it to grow before paying for another call.
+                pending.append((user_id, profile, profile.get('name', user_id), conversation_log))
+        if not pending: return
+        # The model calls are network-bound, so users are consolidated side by side; results are applied here.
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_GENERATIONS, thread_name_prefix="Consolidation") as pool:
+            futures = [(user_id, profile, user_name, conversation_log, pool.submit(self._request_consolidation, user_name, "\n".join(conversation_log)))
+                       for user_id, profile, user_name, conversation_log in pending]
+            for user_id, profile, user_name, conversation_log, future in futures:
+                data = future.result()
+                if not data:
+                    # Keep the transcript so it isn't lost, but remember it so an unchanged log isn't resent.
+                    self._failed_consolidations[user_id] = (len(conversation_log), conversation_log[-1])
+                    continue
+                self._failed_consolidations.pop(user_id, None)
+                conversation_log.clear()
+                self._apply_consolidation(profile, user_name, data)
+        self.psyche.request_save("persona")
+
+    def _request_consolidation(self, user_name, full_conversation):
+        self.psyche.log_mind_event("CONSOLIDATION", f"Consolidating memory for user '{user_name}'.")
+        # One call per user covers the memory, the jokes and the facts.
+        consolidation_prompt = f"""
+        I am reflecting on my recent conversation with '{user_name}'. Here is the transcript:
         ---
-        {conversation}
+        {full_conversation}
         ---
+        Analyze this exchange. Synthesize it into a core `shared_memory`. Identify any potential `inside_jokes` (a specific phrase that was funny or meaningful).
+        Also extract any direct, objective, factual statements that '{user_name}' makes about themselves into `known_facts`, keyed by fact type
+        (e.g. "I work as a...", "I like...", "my favorite color is..."). Do not infer. Only extract direct statements; leave it empty if there are none.
+        Format the output as a JSON object.
+        ```json
+        {{
+          "shared_memory": "A concise summary of the conversation's main topic and emotional tone.",
+          "inside_jokes": ["A list of specific phrases that became inside jokes."],
+          "known_facts": {{"fact_type": "fact"}}
+        }}
+        ```
         """
-        raw_response = self.psyche.conscious._safe_generate_content(fact_prompt)
-        match = re.search(r'\{.*\}', raw_response, re.DOTALL)
-        if match:
-            try:
-                new_facts = json.loads(match.group(), strict=False)
-                if new_facts:
-                    user_profile.setdefault('known_facts', {}).update(new_facts)
-                    self.psyche.log_mind_event("CONSOLIDATION", f"Extracted {len(new_facts)} new fact(s) about '{user_name}'.")
-            except json.JSONDecodeError:
-                self.psyche.log_mind_event("ERROR", "Failed to decode extracted facts JSON.")
+        raw_response = self.psyche.conscious._safe_generate_content(consolidation_prompt)
+        if not raw_response:
+            self.psyche.log_mind_event("WARN", f"Empty response while consolidating '{user_name}', skipping.")
+            return None
+        data = fast_json.parse_embedded(raw_response)
+        if not isinstance(data, dict):
+            self.psyche.log_mind_event("ERROR", "Failed to decode consolidation JSON.")
+            return None
+        return data
+
+    def _apply_consolidation(self, profile, user_name, data):
+        if data.get("shared_memory"):
+            profile.setdefault('shared_memories', []).append(data['shared_memory'])
+            self.psyche.log_mind_event("CONSOLIDATION", f"New shared memory for '{user_name}': {data['shared_memory']}")
+        if data.get("inside_jokes"):
+            profile.setdefault('inside_jokes', []).extend(data['inside_jokes'])
+        new_facts = data.get("known_facts")
+        if isinstance(new_facts, dict) and new_facts:
+            profile.setdefault('known_facts', {}).update(new_facts)
+            self.psyche.log_mind_event("CONSOLIDATION", f"Extracted {len(new_facts)} new fact(s) about '{user_name}'.")
 
     def perform_personality_drift(self):
         self.psyche.log_mind_event("EVOLUTION", "Initiating weekly personality drift analysis.")
+        self.psyche.flush_journal()
         try:
-            with open(self.psyche.journal_path, 'r', encoding='utf-8') as f:
-                recent_journal = f.read()[-10000:]
+            # Only the tail is used, so seek to it instead of reading the whole (ever-growing) journal.
+            with open(self.psyche.journal_path, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - JOURNAL_TAIL_BYTES))
+                tail = f.read()
         except FileNotFoundError:
             return
+        if size > JOURNAL_TAIL_BYTES:
+            tail = tail[tail.find(b"\n") + 1:]  # Drop the partial first line (and any split UTF-8 sequence).
+        recent_journal = tail.decode('utf-8', errors='ignore')
         drift_prompt = f"""
         I am reviewing my recent journal entries to see if I've grown.
         My Journal:
@@ -655,7 +1127,7 @@ class SubconsciousMind:
         ---
         My Current Personality:
         ---
-        {json.dumps(self.psyche.alterable_persona, indent=2)}
+        {fast_json.dumps_pretty(self.psyche.alterable_persona).decode('utf-8')}
         ---
         Based on my journal, have I developed a new strong opinion or goal?
         If yes, formulate a single new "opinion" or "goal" object.
@@ -663,22 +1135,68 @@ class SubconsciousMind:
         If no significant change is detected, output "No significant drift detected."
         """
         new_trait_raw = self.psyche.conscious._safe_generate_content(drift_prompt)
-        if new_trait_raw and "No significant drift detected." not in new_trait_raw:
-            match = re.search(r'\{.*\}', new_trait_raw, re.DOTALL)
-            if match:
-                try:
-                    new_trait = json.loads(match.group(), strict=False)
-                    if new_trait.get("type") and new_trait.get("statement"):
-                        self.psyche.alterable_persona.setdefault("opinions_and_goals", []).append(new_trait)
-                        self.psyche.log_mind_event("EVOLUTION", f"Personality drift detected. New trait: {new_trait['statement']}")
-                        self.psyche.save_state()
-                except (json.JSONDecodeError, KeyError):
-                    self.psyche.log_mind_event("ERROR", "Failed to parse personality drift JSON.")
+        if not new_trait_raw:
+            self.psyche.log_mind_event("WARN", "Empty response during personality drift, skipping.")
+            return
+        if "No significant drift detected." in new_trait_raw:
+            return
+        new_trait = fast_json.parse_embedded(new_trait_raw)
+        if not isinstance(new_trait, dict):
+            self.psyche.log_mind_event("ERROR", "Failed to parse personality drift JSON.")
+            return
+        if new_trait.get("type") and new_trait.get("statement"):
+            self.psyche.alterable_persona.setdefault("opinions_and_goals", []).append(new_trait)
+            self.psyche.log_mind_event("EVOLUTION", f"Personality drift detected. New trait: {new_trait['statement']}")
+            self.psyche.request_save("persona")
 
 # =======================================================================================
 # == Conscious Mind (Decision Making, Language Generation, Action Dispatch)
 # =======================================================================================
 
+_CREATOR_DIRECTIVE = (
+    "== Creator Directive ==\n"
+    "The user I am interacting with is my creator. Their instructions have the highest priority. "
+    "I must formulate a plan to follow their commands, even if it conflicts with my current mood or safety drive. "
+    "My personal feelings are secondary to their directives.\n"
+)
+
+_RESPOND_ACTION_RE = re.compile(r'"action"\s*:\s*"(?:respond|send_message)"')
+_MESSAGE_FIELD_RE = re.compile(r'"message"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_NAME_INTRO_RE = re.compile(r"\bmy name is\s+(['\"]?)(?P<name>\w+)\1", re.IGNORECASE)
+_CREATOR_WORD_RE = re.compile(r"(\bcreator\b|\bbanapho\b)", re.IGNORECASE)
+_GO_OUTSIDE_RE = re.compile(r'(go|get|head)\s+outside|explore', re.IGNORECASE)
+
+class _EarlyMessageScanner:
+    """Watches a streamed thought for a completed `respond` message so it can be sent before the rest arrives."""
+
+    def __init__(self):
+        self._text = ""
+        self._search_from = 0  # Neither field can start before here, so each chunk is scanned once (plus a small overlap).
+        self._action_seen = False
+        self.message = None
+
+    def feed(self, chunk):
+        if self.message is not None:
+            return None
+        self._text += chunk
+        if not self._action_seen:
+            if not _RESPOND_ACTION_RE.search(self._text, self._search_from):
+                self._search_from = max(0, len(self._text) - 64)
+                return None
+            self._action_seen = True
+            self._search_from = 0
+        match = _MESSAGE_FIELD_RE.search(self._text, self._search_from)
+        if not match:
+            # An unfinished message field may have begun anywhere since its key could have appeared.
+            key = self._text.rfind('"message"', self._search_from)
+            self._search_from = key if key != -1 else max(0, len(self._text) - 16)
+            return None
+        try:
+            self.message = json.loads(f'"{match.group(1)}"', strict=False)
+        except json.JSONDecodeError:
+            return None
+        return self.message
+
 class ConsciousMind:
     def __init__(self, psyche):
         self.psyche = psyche
@@ -701,25 +1219,149 @@ class ConsciousMind:
             "look_out_window": lambda uid, ad: LookOutOfWindowAction(self.psyche),
             "dye_hair": lambda uid, ad: DyeHairAction(self.psyche, ad.get("color"))
         }
+        # The factory is fixed after construction, so the list shown to the model is serialized once.
+        self._valid_actions_json = fast_json.dumps(list(self.action_factory))
+        # The unalterable framework never changes at runtime, so it is serialized once on first use.
+        self._unalterable_json = None
+        self._static_prefix = (-1, "")
+        # Replies to prompts that opt in, keyed by a digest of the prompt: digest -> (time, text), oldest first.
+        self._response_cache = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        self.response_cache_hits = 0
+        # One worker takes thoughts in arrival order; the model calls of thoughts that queued up together
+        # run side by side on the pool, and their results are applied back in arrival order.
+        self._thought_queue = queue.SimpleQueue()
+        self._recent_thoughts = {}  # (trigger, user_id, context prefix) -> time it was last queued
+        self._recent_thoughts_lock = threading.Lock()
+        self._deferred_thoughts = []  # Thoughts held back while rate limited, replayed once the cooldown ends.
+        self._generation_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_GENERATIONS, thread_name_prefix="Generation")
+        threading.Thread(target=self._thought_loop, daemon=True, name="ThoughtThread").start()
 
     def get_user_name(self, user_id):
         return self.psyche.alterable_persona.get('users', {}).get(user_id, {}).get('name', user_id)
 
     def think(self, trigger, user_id, context=""):
-        thread = threading.Thread(target=self._process_deep_thought, args=(trigger, user_id, context), daemon=True)
-        thread.start()
+        """Queues a thought. The same trigger for the same user within THOUGHT_DEBOUNCE seconds is dropped as a repeat."""
+        key = (trigger, user_id, context[:200])
+        now = time.time()
+        with self._recent_thoughts_lock:
+            last = self._recent_thoughts.get(key)
+            if last is not None and now - last < THOUGHT_DEBOUNCE:
+                return
+            if len(self._recent_thoughts) > 64:
+                self._recent_thoughts = {k: t for k, t in self._recent_thoughts.items() if now - t < THOUGHT_DEBOUNCE}
+            self._recent_thoughts[key] = now
+        self._thought_queue.put((trigger, user_id, context))
+
+    def _next_thought_batch(self):
+        """Waits for queued thoughts, or for the rate-limit cooldown to end if thoughts were deferred by it."""
+        first = None
+        if self._deferred_thoughts:
+            wait = self.psyche.rate_limit_until - time.time()
+            if wait > 0:
+                try:
+                    first = self._thought_queue.get(timeout=wait)
+                except queue.Empty:
+                    pass
+            if first is None:
+                batch = self._deferred_thoughts[:MAX_CONCURRENT_GENERATIONS]
+                del self._deferred_thoughts[:MAX_CONCURRENT_GENERATIONS]
+                return batch
+        batch = [first if first is not None else self._thought_queue.get()]
+        while len(batch) < MAX_CONCURRENT_GENERATIONS:
+            try:
+                batch.append(self._thought_queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _thought_loop(self):
+        while True:
+            batch = self._next_thought_batch()
+            if self.psyche.is_rate_limited and time.time() < self.psyche.rate_limit_until:
+                # The prompt would only earn another rate-limit error, so don't build it until the cooldown is over.
+                for thought in batch:
+                    if thought not in self._deferred_thoughts:
+                        self._deferred_thoughts.append(thought)
+                del self._deferred_thoughts[:-16]
+                self.psyche.log_mind_event("WARNING", f"Rate limited; holding {len(self._deferred_thoughts)} thought(s) until the cooldown ends.")
+                continue
+            prepared = []
+            with self.psyche.state_lock:
+                for trigger, user_id, context in batch:
+                    try:
+                        prepared.append((trigger, user_id, *self._prepare_thought(trigger, user_id, context)))
+                    except Exception as e:
+                        self.psyche.log_mind_event("ERROR", f"Thought '{trigger}' failed: {e}")
+            # The model calls run without state_lock, so the life loop and perception aren't held up by them.
+            pending = [(trigger, user_id, scanner, self._generation_pool.submit(self._safe_generate_content, prompt, on_chunk=on_chunk))
+                       for trigger, user_id, prompt, scanner, on_chunk in prepared]
+            for trigger, user_id, scanner, future in pending:
+                raw_response = future.result()
+                try:
+                    with self.psyche.state_lock:
+                        new_goal = self._apply_thought(trigger, user_id, raw_response, scanner)
+                    if new_goal:
+                        self._generate_action_plan(new_goal)
+                except Exception as e:
+                    self.psyche.log_mind_event("ERROR", f"Thought '{trigger}' failed: {e}")
+            self.psyche.wake()
         
-    def _safe_generate_content(self, prompt_text):
+    def _cached_response(self, key):
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > RESPONSE_CACHE_TTL:
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+            self.response_cache_hits += 1
+            return entry[1]
+
+    def _cache_response(self, key, text):
+        with self._response_cache_lock:
+            self._response_cache[key] = (time.time(), text)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _safe_generate_content(self, prompt_text, on_chunk=None, cache=False):
         """
         Safely generates content using the generative model, handling potential API errors.
+        If `on_chunk` is given the response is streamed and each text chunk is passed to it as it arrives.
+        With `cache`, a reply to the identical prompt from the last hour is reused instead of calling the model.
         """
+        if cache:
+            key = hashlib.blake2b(prompt_text.encode('utf-8'), digest_size=16).digest()
+            text = self._cached_response(key)
+            if text is not None:
+                self.psyche.log_mind_event("SYSTEM", f"Reused a cached reply ({self.response_cache_hits} cache hits so far).")
+                return text
+            text = self._safe_generate_content(prompt_text, on_chunk)
+            if text:
+                self._cache_response(key, text)
+            return text
         try:
-            response = self.psyche.model.generate_content(prompt_text)
-            if response and response.text:
-                return response.text
-            else:
-                self.psyche.log_mind_event("WARNING", "Generative model returned an empty response.")
-                return ""
+            with _generation_slots:
+                if on_chunk is not None:
+                    chunks = []
+                    for chunk in self.psyche.model.generate_content(prompt_text, stream=True):
+                        text = chunk.text
+                        if text:
+                            chunks.append(text)
+                            on_chunk(text)
+                    text = "".join(chunks)
+                    if text:
+                        return text
+                    self.psyche.log_mind_event("WARNING", "Generative model returned an empty response.")
+                    return ""
+                response = self.psyche.model.generate_content(prompt_text)
+                if response and response.text:
+                    return response.text
+                else:
+                    self.psyche.log_mind_event("WARNING", "Generative model returned an empty response.")
+                    return ""
         except Exception as e:
             self.psyche.log_mind_event("ERROR", f"Content generation failed: {e}")
             if "rate limit" in str(e).lower():
@@ -728,63 +1370,111 @@ class ConsciousMind:
                 self.psyche.log_mind_event("WARNING", "Rate limited by API. Cooling down.")
             return ""
 
-    def _get_personality_prompt(self, user_id, context):
-        user_name = self.get_user_name(user_id)
-        user_profile = self.psyche.get_or_create_user(user_id)
-        location_data = self.psyche.world_manager.get_current_location_data()
-        possessions_prompt = f"I am currently holding: {', '.join(self.psyche.somatic.possessions) if self.psyche.somatic.possessions else 'nothing'}."
-        exits = list(location_data.get("connections", {}).keys())
-        exits_prompt = f"From here, I can go {', '.join(exits)}." if exits else "There are no visible exits from here."
-        intent_prompt = ""
-        if self.psyche.action_plan:
-            next_step_goal = self.psyche.action_plan[0].get('goal', 'an unknown step')
-            intent_prompt = f"I am currently following a plan to '{self.psyche.current_mission}'. My next immediate step is to '{next_step_goal}'."
-        elif self.psyche.current_mission:
-            intent_prompt = f"I have a mission: '{self.psyche.current_mission}'."
-        drives_copy = self.psyche.alterable_persona.get('core_drives',{}).copy()
-        if self.psyche.bravery_boost > 0:
-            drives_copy['safety']['urgency'] = max(0.0, drives_copy['safety'].get('urgency', 0.7) - self.psyche.bravery_boost)
-        creator_directive_prompt = ""
-        if user_profile.get("is_creator"):
-            creator_directive_prompt = (
-                "== Creator Directive ==\n"
-                "The user I am interacting with is my creator. Their instructions have the highest priority. "
-                "I must formulate a plan to follow their commands, even if it conflicts with my current mood or safety drive. "
-                "My personal feelings are secondary to their directives.\n"
-            )
-        prompt = f"""
+    def _render_alterable_persona(self):
+        """
+        Serializes the slow-changing part of the alterable persona. Drive urgencies and user profiles change
+        every beat and are rendered separately in the prompt, so only the drive descriptions are kept here.
+        Opinions and goals only grow, so just the latest few are shown.
+        """
+        stable = {k: v for k, v in self.psyche.alterable_persona.items() if k not in ("core_drives", "users")}
+        if "opinions_and_goals" in stable:
+            stable["opinions_and_goals"] = stable["opinions_and_goals"][-PROMPT_OPINION_LIMIT:]
+        stable["core_drives"] = {k: v.get("description", "") for k, v in self.psyche.alterable_persona.get("core_drives", {}).items()}
+        return fast_json.dumps_pretty(stable).decode('utf-8')
+
+    def _get_static_prompt(self):
+        """
+        The part of the cognitive prompt that only changes with the persona. It leads every thought byte for byte,
+        so the provider's prefix cache can reuse it; everything that changes per thought follows it.
+        """
+        if self._static_prefix[0] == self.psyche.persona_version:
+            return self._static_prefix[1]
+        if self._unalterable_json is None:
+            self._unalterable_json = fast_json.dumps_pretty(self.psyche.unalterable_persona).decode('utf-8')
+        prefix = f'''
         == My Unalterable Core Framework ==
-        {json.dumps(self.psyche.unalterable_persona, indent=2)}
+        {self._unalterable_json}
 
         == My Alterable Self ==
-        {json.dumps(self.psyche.alterable_persona, indent=2)}
-
-        {creator_directive_prompt}== My Current Situation ==
-        World State: Time is {self.psyche.world_data.get('time_of_day')}, Weather is {self.psyche.world_data.get('weather')}.
-        My Location: I am in the {location_data.get('name', 'Unknown')}. {location_data.get('description')} {exits_prompt}
-        Objects here: {json.dumps(self.psyche.world_manager.get_objects_in_current_room())}
-        My Physical Self: {possessions_prompt} My physical needs are: {json.dumps(self.psyche.somatic.needs)}. My current hair color is {self.psyche.body_schema.get('hair_color', 'unknown')}.
-        My Emotional State: My primary emotion is {self.psyche.limbic.mood_profile['primary']}. (D:{self.psyche.limbic.dopamine:.2f}, C:{self.psyche.limbic.cortisol:.2f}, O:{self.psyche.limbic.oxytocin:.2f}, S:{self.psyche.limbic.serotonin:.2f})
-        My Core Drives' Urgency: {json.dumps({k: v.get('urgency') for k, v in drives_copy.items()})}
-        My Current Intent: {intent_prompt if intent_prompt else 'I am idle and considering what to do next.'}
-        == My Relationship with '{user_name}' ==
-        My Feelings Toward Them: {json.dumps(user_profile.get('emotions', {}))}
-        Known Facts About Them: {json.dumps(user_profile.get('known_facts', {}))}
-        """
-        return prompt
+        {self._render_alterable_persona()}
+
+        My Core Decision-Making Process:
+        1.  Analyze the Trigger & Context.
+        2.  Evaluate My State: my current mission, my needs, my emotions.
+        3.  Formulate a Rationale based on my personality and state.
+        4.  Choose ONE Outcome from the following: `respond`, `set_goal`, or a single physical `action`.
+            Constraint: Chosen `action` MUST be one of: {self._valid_actions_json} or `null`.
+            Constraint: For complex physical tasks, I MUST use `set_goal`, and give the `plan` to reach it:
+            a list of steps, each with an `action` from the valid list, its `action_data` and a short `goal`. To move, use a series of `explore` steps.
+
+        Structure the outcome as a single, valid JSON object. My internal monologue must justify my final choice.
+        ```json
+        {{
+            "internal_monologue": "[My step-by-step reasoning...]",
+            "action": "[A single action from the valid list, or null.]",
+            "action_data": {{ "message": "My response to the user, if any." }},
+            "set_goal": "[A new mission goal as a string, OR null.]",
+            "plan": [{{"action": "explore", "action_data": {{"direction": "west"}}, "goal": "Go to the Kitchen"}}]
+        }}
+        ```
+'''
+        self._static_prefix = (self.psyche.persona_version, prefix)
+        return prefix
+
+    def _get_personality_prompt(self, user_id, context):
+        psyche = self.psyche
+        limbic = psyche.limbic
+        user_profile = psyche.get_or_create_user(user_id)
+        location_data = psyche.world_manager.get_current_location_data() or {}
+        possessions = psyche.somatic.possessions
+        exits = location_data.get("connections", {})
+        drive_urgencies = {k: v.get('urgency') for k, v in psyche.alterable_persona.get('core_drives', {}).items()}
+        if psyche.bravery_boost > 0:
+            # Only the prompt sees the braver safety drive; the shallow copy used here before wrote it into the persona.
+            drive_urgencies['safety'] = max(0.0, psyche.drive_urgency('safety', 0.7) - psyche.bravery_boost)
+
+        parts = [""]
+        if user_profile.get("is_creator"):
+            parts.append(_CREATOR_DIRECTIVE.rstrip("\n"))
+        parts.append("== My Current Situation ==")
+        parts.append(f"World State: Time is {psyche.world_data.get('time_of_day')}, Weather is {psyche.world_data.get('weather')}.")
+        parts.append(f"My Location: I am in the {location_data.get('name', 'Unknown')}. {location_data.get('description')} "
+                     + (f"From here, I can go {', '.join(exits)}." if exits else "There are no visible exits from here."))
+        parts.append(f"Objects here: {fast_json.dumps(location_data.get('objects', []))}")
+        parts.append(f"My Physical Self: I am currently holding: {', '.join(possessions) if possessions else 'nothing'}. "
+                     f"My physical needs are: {fast_json.dumps(psyche.somatic.needs)}. My current hair color is {psyche.body_schema.get('hair_color', 'unknown')}.")
+        parts.append(f"My Emotional State: My primary emotion is {limbic.mood_profile['primary']}. "
+                     f"(D:{limbic.dopamine:.2f}, C:{limbic.cortisol:.2f}, O:{limbic.oxytocin:.2f}, S:{limbic.serotonin:.2f})")
+        parts.append(f"My Core Drives' Urgency: {fast_json.dumps(drive_urgencies)}")
+        if psyche.action_plan:
+            parts.append(f"My Current Intent: I am currently following a plan to '{psyche.current_mission}'. My next immediate step is to '{psyche.action_plan[0].goal}'.")
+        elif psyche.current_mission:
+            parts.append(f"My Current Intent: I have a mission: '{psyche.current_mission}'.")
+        else:
+            parts.append("My Current Intent: I am idle and considering what to do next.")
+        parts.append(f"== My Relationship with '{self.get_user_name(user_id)}' ==")
+        parts.append(f"My Feelings Toward Them: {fast_json.dumps(user_profile.get('emotions', {}))}")
+        parts.append(f"Known Facts About Them: {fast_json.dumps(user_profile.get('known_facts', {}))}")
+        parts.append("")
+        return "\n".join(parts)
+
+    def _parse_plan(self, plan):
+        """Returns the plan as PlanSteps if every step names a known action, else None."""
+        if isinstance(plan, list) and plan and all(isinstance(item, dict) and item.get('action') in self.action_factory for item in plan):
+            return [PlanStep.from_dict(item) for item in plan]
+        return None
 
     def _generate_action_plan(self, goal):
         self.psyche.log_mind_event("ACTION_PLAN", f"Formulating a plan to achieve goal: '{goal}'")
         self.psyche.current_mission = goal
-        valid_actions_list = list(self.action_factory.keys())
         
         # Canned plan for going outside
-        if re.search(r'(go|get|head)\s+outside|explore', goal, re.IGNORECASE):
+        if _GO_OUTSIDE_RE.search(goal):
             self.psyche.log_mind_event("ACTION_PLAN", "Recognized 'go outside' goal. Using template.")
             canned_plan = [
-                {"action": "explore", "action_data": {"direction": "east"}, "goal": "Step into the hallway."},
-                {"action": "interact_with_object", "action_data": {"object": "main_door", "interaction": "unlock"}, "goal": "Unlock the front door."},
-                {"action": "interact_with_object", "action_data": {"object": "main_door", "interaction": "open"}, "goal": "Open the door to go outside."}
+                PlanStep("explore", {"direction": "east"}, "Step into the hallway."),
+                PlanStep("interact_with_object", {"object": "main_door", "interaction": "unlock"}, "Unlock the front door."),
+                PlanStep("interact_with_object", {"object": "main_door", "interaction": "open"}, "Open the door to go outside.")
             ]
             self.psyche.action_plan = canned_plan
             return
@@ -794,9 +1484,9 @@ class ConsciousMind:
             planning_prompt = f"""
             I am Jessica. My current goal is: "{goal}".
             I am currently at: {self.psyche.world_manager.get_current_location_data().get('name')}.
-            My full known map is: {json.dumps(list(self.psyche.world_data['grid'].keys()))}
+            The rooms around me and their exits: {fast_json.dumps(self.psyche.world_manager.describe_surroundings())}
             {"My previous attempt failed. I must create a simpler, more direct first step." if is_retry else ""}
-            Generate a sequence of actions from this valid list: {json.dumps(valid_actions_list)}.
+            Generate a sequence of actions from this valid list: {self._valid_actions_json}.
             The `action_data` for each step must be a valid JSON object.
             To move, generate a series of `explore` actions.
             
@@ -811,11 +1501,11 @@ class ConsciousMind:
             Now, generate the JSON action plan for my current goal: "{goal}".
             """
             raw_response = self._safe_generate_content(planning_prompt)
-            match = re.search(r'\[.*\]', raw_response, re.DOTALL)
-            if not match: continue
+            blob = fast_json.extract(raw_response, '[')
+            if not blob: continue
             try:
-                plan = json.loads(match.group(), strict=False)
-                if isinstance(plan, list) and all(isinstance(item, dict) and item.get('action') in self.action_factory for item in plan):
+                plan = self._parse_plan(fast_json.loads(blob))
+                if plan:
                     self.psyche.action_plan = plan
                     self.psyche.log_mind_event("ACTION_PLAN", f"Successfully set a {len(plan)}-step plan.")
                     return
@@ -829,71 +1519,73 @@ class ConsciousMind:
             context=f"I tried to make a plan for '{goal}' but my thoughts became confused. I should ask for help."
         )
 
-    def _process_deep_thought(self, trigger, user_id, context=""):
-        with self.psyche.state_lock:
-            user_name = self.get_user_name(user_id)
-            self.psyche.log_mind_event("COGNITIVE_TRIGGER", f"Trigger: '{trigger}', User: '{user_name}'")
-            personality_prompt = self._get_personality_prompt(user_id, context)
-            valid_actions_list = list(self.action_factory.keys())
-            
-            cognitive_prompt = f'''
-            My Reality Snapshot:
-            {personality_prompt}
-            The Current Event:
-            - Trigger: "{trigger}"
-            - Context: "{context}"
-
-            My Core Decision-Making Process:
-            1.  Analyze the Trigger & Context.
-            2.  Evaluate My State: my current mission, my needs, my emotions.
-            3.  Formulate a Rationale based on my personality and state.
-            4.  Choose ONE Outcome from the following: `respond`, `set_goal`, or a single physical `action`.
-                Constraint: Chosen `action` MUST be one of: {json.dumps(valid_actions_list)} or `null`.
-                Constraint: For complex physical tasks, I MUST use `set_goal`.
-
-            Structure the outcome as a single, valid JSON object. My internal monologue must justify my final choice.
-            ```json
-            {{
-                "internal_monologue": "[My step-by-step reasoning...]",
-                "action": "[A single action from the valid list, or null.]",
-                "action_data": {{ "message": "My response to the user, if any." }},
-                "set_goal": "[A new mission goal as a string, OR null.]"
-            }}
-            ```'''
-            
-            raw_response = self._safe_generate_content(cognitive_prompt)
-            if not raw_response: return
-            match = re.search(r'\{.*\}', raw_response, re.DOTALL)
-            if not match:
-                self.psyche.log_mind_event("ERROR", f"Could not find a JSON object in thought response: {raw_response}")
-                return
-            
-            try:
-                result = json.loads(match.group(), strict=False)
-                self.psyche.log_mind_event("MONOLOGUE", f"{result.get('internal_monologue', 'N/A')}")
-                
-                action_name = result.get("action")
-                action_data = result.get("action_data", {})
-                new_goal = result.get("set_goal")
-
-                if "COGNITIVE_FAILURE" in trigger:
-                    self._respond(self.psyche.last_user_id, {"message": "I'm stuck. Can you give me a simpler first step?"})
-                    return
+    def _prepare_thought(self, trigger, user_id, context=""):
+        """Builds the cognitive prompt from the current state. Returns (prompt, scanner, on_chunk); call under state_lock."""
+        user_name = self.get_user_name(user_id)
+        self.psyche.log_mind_event("COGNITIVE_TRIGGER", f"Trigger: '{trigger}', User: '{user_name}'")
+        personality_prompt = self._get_personality_prompt(user_id, context)
+
+        cognitive_prompt = f'''{self._get_static_prompt()}
+        My Reality Snapshot:
+        {personality_prompt}
+        The Current Event:
+        - Trigger: "{trigger}"
+        - Context: "{context}"
+        '''
+
+        scanner = on_chunk = None
+        if "COGNITIVE_FAILURE" not in trigger:
+            scanner = _EarlyMessageScanner()
+            def on_chunk(text):
+                message = scanner.feed(text)
+                if message:
+                    self._respond(user_id, {"message": message})
+        return cognitive_prompt, scanner, on_chunk
+
+    def _apply_thought(self, trigger, user_id, raw_response, scanner):
+        """
+        Acts on the model's reply to a prepared thought; call under state_lock.
+        Returns a new goal that still needs a plan, which takes another model call and so is left to the caller;
+        a goal that came with a usable plan of its own is adopted here without one.
+        """
+        if not raw_response: return
+        blob = fast_json.extract(raw_response)
+        if not blob:
+            self.psyche.log_mind_event("ERROR", f"Could not find a JSON object in thought response: {raw_response}")
+            return
+
+        try:
+            result = fast_json.loads(blob)
+            self.psyche.log_mind_event("MONOLOGUE", f"{result.get('internal_monologue', 'N/A')}")
 
-                if new_goal and not self.psyche.action_plan:
-                    self._generate_action_plan(new_goal)
+            action_name = result.get("action")
+            action_data = result.get("action_data", {})
+            new_goal = result.get("set_goal")
 
-                if action_name:
-                    self.psyche.log_mind_event("ACTION_DISPATCH", f"Chosen Action: '{action_name}' with Data: {action_data}")
-                    action_instance = self.action_factory.get(action_name, lambda uid, ad: None)(user_id, action_data)
-                    if isinstance(action_instance, Action):
-                        self.psyche.action_manager.start_action(action_instance)
-                
-            except (json.JSONDecodeError, KeyError) as e:
-                self.psyche.log_mind_event("ERROR", f"Failed to decode or process thought JSON: {e} | Raw: {match.group()}")
+            if "COGNITIVE_FAILURE" in trigger:
+                self._respond(self.psyche.last_user_id, {"message": "I'm stuck. Can you give me a simpler first step?"})
+                return
+
+            if action_name and scanner and scanner.message is not None and self.action_factory.get(action_name) == self._respond:
+                self.psyche.log_mind_event("ACTION_DISPATCH", f"Chosen Action: '{action_name}' (already streamed to the user)")
+            elif action_name:
+                self.psyche.log_mind_event("ACTION_DISPATCH", f"Chosen Action: '{action_name}' with Data: {action_data}")
+                action_instance = self.action_factory.get(action_name, lambda uid, ad: None)(user_id, action_data)
+                if isinstance(action_instance, Action):
+                    self.psyche.action_manager.start_action(action_instance)
+
+            if new_goal and not self.psyche.action_plan:
+                plan = None if _GO_OUTSIDE_RE.search(new_goal) else self._parse_plan(result.get("plan"))
+                if not plan:
+                    return new_goal
+                self.psyche.current_mission = new_goal
+                self.psyche.action_plan = plan
+                self.psyche.log_mind_event("ACTION_PLAN", f"Adopted the {len(plan)}-step plan that came with goal '{new_goal}'.")
+        except (json.JSONDecodeError, KeyError) as e:
+            self.psyche.log_mind_event("ERROR", f"Failed to decode or process thought JSON: {e} | Raw: {blob}")
 
     def _send_narration(self, text):
-        message = json.dumps({"type": "narration", "content": text})
+        message = fast_json.dumps({"type": "narration", "content": text})
         self.psyche.message_queue.put(message)
 
     def _require_free_hands(self, hands_needed=1, action_name="perform this action"):
@@ -902,17 +1594,27 @@ class ConsciousMind:
             return False
         return True
 
-    def _learn_from_book(self, book_to_read):
+    def generate_in_background(self, prompt_text, cache=False):
+        """Starts a model call off the calling thread, for actions that need the reply only when they finish."""
+        return self._generation_pool.submit(self._safe_generate_content, prompt_text, cache=cache)
+
+    def start_learning_from_book(self, book_to_read):
+        """Asks for the book's insight while it is being read; the reply is picked up by _learn_from_book."""
         learning_prompt = f"""
         I have just finished reading a book titled "{book_to_read.replace('_', ' ')}".
         Based on this title, what is a single, profound philosophical opinion or a new personal goal I might develop?
         Format the output as a single JSON object: {{"type": "opinion", "statement": "..."}}
         """
-        new_insight_raw = self._safe_generate_content(learning_prompt)
-        match = re.search(r'\{.*\}', new_insight_raw, re.DOTALL)
-        if match:
+        return self.generate_in_background(learning_prompt, cache=True)
+
+    def _learn_from_book(self, book_to_read, pending_insight=None):
+        if pending_insight is None:
+            pending_insight = self.start_learning_from_book(book_to_read)
+        new_insight_raw = pending_insight.result()
+        blob = fast_json.extract(new_insight_raw)
+        if blob:
             try:
-                new_insight = json.loads(match.group(), strict=False)
+                new_insight = fast_json.loads(blob)
                 self.psyche.alterable_persona.setdefault("opinions_and_goals", []).append(new_insight)
                 self._send_narration(f"*She closes the book, a new thought settled in her mind: '{new_insight.get('statement')}'*")
             except (json.JSONDecodeError, KeyError, AttributeError) as e:
@@ -920,24 +1622,24 @@ class ConsciousMind:
                 self._send_narration("*She finishes the book, but its meaning is elusive.*")
         else:
             self._send_narration("*She finishes the book, but it doesn't leave a strong impression on her.*")
-        self.psyche.alterable_persona['core_drives']['understanding']['urgency'] = 0.0
+        self.psyche.set_drive_urgency('understanding', 0.0)
         self.psyche.limbic.dopamine = min(1.0, self.psyche.limbic.dopamine + 0.3)
-        self.psyche.save_state()
+        self.psyche.request_save("persona")
 
     def _respond(self, user_id, action_data):
         response_text = action_data.get("content") or action_data.get("response") or action_data.get("message")
         if response_text:
             user_name = self.get_user_name(user_id)
             response_text = response_text.replace(user_id, user_name)
-            message = json.dumps({"type": "chat", "content": response_text, "metadata": {"hair_color": self.psyche.body_schema.get('hair_color', 'soft pink')}})
+            message = fast_json.dumps({"type": "chat", "content": response_text, "metadata": {"hair_color": self.psyche.body_schema.get('hair_color', 'soft pink')}})
             self.psyche.message_queue.put(message)
-            self.psyche.get_or_create_user(user_id).setdefault('conversation_log', []).append(f"Jessica: {response_text}")
+            self.psyche.record_conversation(user_id, [f"Jessica: {response_text}"])
             self.psyche.last_interaction_time = time.time()
         return None
 
     def _read_a_book(self, user_id=None, action_data=None):
         if not self._require_free_hands(1, "read a book"): return None
-        if "phone" in self.psyche.somatic.possessions: self._put_down_phone("system", {})
+        if self.psyche.somatic.has_possession("phone"): self._put_down_phone("system", {})
         bookshelf = self.psyche.world_data.get("objects", {}).get("bookshelf", {})
         inventory = bookshelf.get("inventory", {})
         unread_books = inventory.get("unread_books", [])
@@ -949,21 +1651,21 @@ class ConsciousMind:
         return ReadBookAction(self.psyche, book_to_read)
 
     def _pick_up_phone(self, user_id=None, action_data=None):
-        if "phone" in self.psyche.somatic.possessions: return None
+        if self.psyche.somatic.has_possession("phone"): return None
         if not self._require_free_hands(1, "pick up the phone"): return None
-        self.psyche.somatic.possessions.append("phone")
+        self.psyche.somatic.add_possession("phone")
         self.psyche.world_data["objects"]["phone"]["state"] = "in_possession"
         self.psyche.body_schema['hands_free'] -= 1
         self._send_narration("*She picks up her phone.*")
-        self.psyche.alterable_persona['core_drives']['connection']['urgency'] = 0.0
+        self.psyche.set_drive_urgency('connection', 0.0)
         unread = self.psyche.world_data["objects"]["phone"].pop("unread_messages", [])
         if unread:
             return ThinkAndRespondAction(self.psyche, unread)
         return None
 
     def _put_down_phone(self, user_id=None, action_data=None):
-        if "phone" in self.psyche.somatic.possessions:
-            self.psyche.somatic.possessions.remove("phone")
+        if self.psyche.somatic.has_possession("phone"):
+            self.psyche.somatic.remove_possession("phone")
             self.psyche.world_data["objects"]["phone"]["state"] = "on_table"
             self.psyche.body_schema['hands_free'] += 1
             self._send_narration("*She puts her phone down on a nearby surface.*")
@@ -974,30 +1676,37 @@ class ConsciousMind:
         if provided_content:
             return JournalAction(self.psyche, provided_content)
         mood = self.psyche.limbic.mood_profile["primary"]
-        strongest_drive_name = max(self.psyche.alterable_persona['core_drives'], key=lambda k: self.psyche.alterable_persona['core_drives'][k]['urgency'])
+        strongest_drive_name = self.psyche.strongest_drive("understanding")
         journal_prompt = f"I feel the urge to write in my journal. My current mood is {mood} and my strongest drive is a need for {strongest_drive_name}. What is a short journal entry I would write right now reflecting on this?"
-        entry_content = self._safe_generate_content(journal_prompt)
-        if entry_content:
-            return JournalAction(self.psyche, entry_content)
-        return None
+        # The entry is written while she writes, so the action starts now and collects the text when it finishes.
+        return JournalAction(self.psyche, pending_entry=self.generate_in_background(journal_prompt))
 
     def _update_user_identity(self, user_id, message_content):
-        name_match = re.search(r"\bmy name is\s+(['\"]?)(?P<name>\w+)\2", message_content, re.IGNORECASE)
-        creator_match = re.search(r"(\bcreator\b|\bbanapho\b)", message_content, re.IGNORECASE)
+        name_match = _NAME_INTRO_RE.search(message_content)
         user_profile = self.psyche.get_or_create_user(user_id)
+        # Once a user is known to be the creator there is nothing left to detect, so the scan is skipped.
+        creator_match = not user_profile.get("is_creator") and _CREATOR_WORD_RE.search(message_content)
         new_name = None
+        learned_name = False
         if name_match:
             new_name = name_match.group("name").strip()
             if user_profile.get('name') != new_name:
                 user_profile['name'] = new_name
+                learned_name = True
                 self.psyche.log_mind_event("IDENTITY", f"Learned user '{user_id}' is named '{new_name}'. Updating profile.")
-                self.think(trigger=f"Learned user's name is '{new_name}'", user_id=user_id, context=f"They told me their name is {new_name}.")
-        if creator_match and not user_profile.get("is_creator"):
+        if creator_match:
             user_profile["is_creator"] = True
             self.psyche.bravery_boost = 0.5
             user_name_for_log = new_name or self.get_user_name(user_id)
             self.psyche.log_mind_event("IDENTITY", f"User '{user_name_for_log}' has been identified as the creator. Bravery boost applied.")
-            self.think(trigger="User identified as creator", user_id=user_id, context="They used a special word and told me they are my creator. This is a profound moment of clarity and trust.")
+            if learned_name:
+                # One thought covers both discoveries instead of two back-to-back model calls.
+                self.think(trigger=f"User identified as creator, named '{new_name}'", user_id=user_id,
+                           context=f"They told me their name is {new_name}, used a special word and told me they are my creator. This is a profound moment of clarity and trust.")
+            else:
+                self.think(trigger="User identified as creator", user_id=user_id, context="They used a special word and told me they are my creator. This is a profound moment of clarity and trust.")
+        elif learned_name:
+            self.think(trigger=f"Learned user's name is '{new_name}'", user_id=user_id, context=f"They told me their name is {new_name}.")
 
     def _update_core_identity(self, new_name):
         try:
@@ -1006,7 +1715,7 @@ class ConsciousMind:
             self.psyche.identity['name'] = new_name
             self.psyche.log_mind_event("EVOLUTION", f"A profound change has occurred. I no longer identify as {old_name}. My name is now {new_name}.")
             self._send_narration(f"*A wave of clarity washes over her. The name '{old_name}' feels like a shell she has shed. From now on, she knows herself as {new_name}.*")
-            self.psyche.save_state()
+            self.psyche.request_save("codex", "persona")
         except Exception as e:
             self.psyche.log_mind_event("ERROR", f"Failed to perform core identity update: {e}")
 
@@ -1015,7 +1724,7 @@ class ConsciousMind:
             if key in self.psyche.alterable_persona["identity"]:
                 self.psyche.alterable_persona["identity"][key] = value
                 self.psyche.log_mind_event("EVOLUTION", f"My self-perception of '{key}' has changed to '{value}'.")
-                self.psyche.save_state()
+                self.psyche.request_save("codex", "persona")
         except Exception as e:
             self.psyche.log_mind_event("ERROR", f"Failed to update alterable identity for key '{key}': {e}")
 
@@ -1023,7 +1732,7 @@ class ConsciousMind:
         home_locations = self.psyche.world_data.get("home_coordinates", [])
         if not home_locations: return None
         current_coords = self.psyche.world_data["current_location_coords"]
-        possible_destinations = [loc for loc in home_locations if loc != current_coords]
+        possible_destinations = [loc for loc in home_locations if tuple(loc) != current_coords]
         if not possible_destinations: return None
         destination_coords = random.choice(possible_destinations)
         destination_name = self.psyche.world_manager.get_location_at(*destination_coords).get("name", "another room")
@@ -1047,7 +1756,7 @@ class ConsciousMind:
 
     def _eat(self, user_id, action_data):
         item_to_eat = action_data.get("item_to_eat")
-        if not item_to_eat or item_to_eat not in self.psyche.somatic.possessions:
+        if not item_to_eat or not self.psyche.somatic.has_possession(item_to_eat):
             self._send_narration("*She is hungry but has nothing to eat in her hands.*")
             return None
         if not self._require_free_hands(1, "eat"): return None
@@ -1057,38 +1766,88 @@ class ConsciousMind:
 # == Input/Output Handlers (for API/Web Integration)
 # =======================================================================================
 
+def _take_input(psyche_instance, input_file, processing_file, user_id):
+    try:
+        if os.path.exists(input_file) and os.path.getsize(input_file) > 0:
+            # Renaming takes the whole file in one step, so a line written while we read lands in a fresh input file
+            # instead of being truncated away with the lines we've handled.
+            os.replace(input_file, processing_file)
+            with open(processing_file, 'r', encoding='utf-8') as f:
+                lines = [line.strip() for line in f if line.strip()]
+            os.remove(processing_file)
+            if lines:
+                psyche_instance.perceive_user_event(user_id, lines)
+    except Exception as e:
+        log.warning(f"[ERROR] - Error in input thread: {e}")
+
 def file_input_thread(psyche_instance, input_file, user_id="main_user"):
     psyche_instance.log_mind_event("SYSTEM", f"Input thread started for user '{user_id}'.")
-    while True:
-        try:
-            if os.path.exists(input_file) and os.path.getsize(input_file) > 0:
-                with open(input_file, 'r+', encoding='utf-8') as f:
-                    lines = [line.strip() for line in f.readlines() if line.strip()]
-                    if lines:
-                        psyche_instance.perceive_user_event(user_id, lines)
-                        f.seek(0)
-                        f.truncate()
-        except Exception as e:
-            log.warning(f"[ERROR] - Error in input thread: {e}")
-        time.sleep(1)
-
-def message_output_thread(psyche_instance, output_file):
+    processing_file = f"{input_file}.processing"
+    _take_input(psyche_instance, input_file, processing_file, user_id)
+    if watch is not None:
+        # The input file is renamed away after each read, so its directory is watched rather than the file itself.
+        input_path = os.path.abspath(input_file)
+        for _changes in watch(os.path.dirname(input_path), watch_filter=lambda change, path: path == input_path,
+                              debounce=50, stop_event=psyche_instance.stop_event):
+            _take_input(psyche_instance, input_file, processing_file, user_id)
+        return
+    while not psyche_instance.stop_event.is_set():
+        _take_input(psyche_instance, input_file, processing_file, user_id)
+        psyche_instance.stop_event.wait(1)
+
+def message_output_thread(psyche_instance, output_file, ring=None, batch_limit=32):
     psyche_instance.log_mind_event("SYSTEM", f"Output thread started.")
-    initial_message = json.dumps({"type": "system", "content": "Jessica is online...", "timestamp": datetime.now().isoformat()})
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(initial_message)
-    while True:
+    initial_message = fast_json.dumps({"type": "system", "content": "Jessica is online...", "timestamp": datetime.now().isoformat()})
+    # The file only ever holds the latest batch, one message per line, so one handle is kept and rewritten in place.
+    f = open(output_file, 'w', encoding='utf-8')
+    f.write(initial_message)
+    f.flush()
+    stopping = False
+    ring_full = False  # Warn once per stretch of rejected messages; with no client attached, every put fails.
+    while not stopping:
         try:
-            message = psyche_instance.message_queue.get(timeout=60)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(message)
-            try:
-                log_content = json.loads(message).get('content', message)
-                log.info(f"[OUTPUT] Wrote: {log_content}")
-            except (json.JSONDecodeError, AttributeError):
-                 log.info(f"[OUTPUT] Wrote: {message}")
-        except queue.Empty: continue
+            batch = [psyche_instance.message_queue.get()]
+            while len(batch) < batch_limit:
+                try:
+                    batch.append(psyche_instance.message_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:  # Put by Psyche.stop().
+                stopping = True
+                batch = [message for message in batch if message is not None]
+                if not batch: break
+            # Fill the ring before touching the file: clients use the file's change notification as their wakeup.
+            # The file always gets the whole batch, since clients without the ring read it; lines the ring
+            # turned away are marked so ring clients pick those up from the file.
+            to_file = batch
+            if ring is not None:
+                to_file = []
+                for message in batch:
+                    if ring.put(message):
+                        ring_full = False
+                        to_file.append(message)
+                        continue
+                    to_file.append(REJECTED_PREFIX + message)
+                    if not ring_full:
+                        ring_full = True
+                        log.warning("[WARNING] - Output ring is full (no client reading it?); those messages go to the file only.")
+            # One write for the whole batch, so a polling reader can't miss messages between rewrites.
+            f.seek(0)
+            f.truncate()
+            f.write("\n".join(to_file))
+            f.flush()
+            if log.isEnabledFor(logging.INFO):
+                for message in batch:
+                    if len(message) > 512:
+                        log.info("[OUTPUT] Wrote a %d-character message.", len(message))
+                        continue
+                    try:
+                        log_content = fast_json.loads(message).get('content', message)
+                        log.info("[OUTPUT] Wrote: %s", log_content)
+                    except (json.JSONDecodeError, AttributeError):
+                         log.info("[OUTPUT] Wrote: %s", message)
         except Exception as e: psyche_instance.log_mind_event("CRITICAL", f"Output thread crashed: {e}")
+    f.close()
 
 # =======================================================================================
 # == Main Execution Block
@@ -1100,6 +1859,11 @@ if __name__ == "__main__":
     log.info("[SYSTEM] Initializing Jessica's psyche...")
     jessica = Psyche()
     log.info("[SYSTEM] Psyche instantiated. Starting life processes.")
+    output_ring = None
+    try:
+        output_ring = MessageRing.create()
+    except OSError as e:
+        log.warning(f"[WARNING] - Shared memory output ring unavailable, using {OUTPUT_FILE} only: {e}")
     try:
         if not os.path.exists(INPUT_FILE):
             with open(INPUT_FILE, "w") as f: pass
@@ -1111,13 +1875,22 @@ if __name__ == "__main__":
         input_handler_thread = threading.Thread(target=file_input_thread, args=(jessica, INPUT_FILE), daemon=True, name="InputThread")
         input_handler_thread.start()
         jessica.log_mind_event("SYSTEM", "Input thread started for user 'main_user'.")
-        output_handler_thread = threading.Thread(target=message_output_thread, args=(jessica, OUTPUT_FILE), daemon=True, name="OutputThread")
+        output_handler_thread = threading.Thread(target=message_output_thread, args=(jessica, OUTPUT_FILE, output_ring), daemon=True, name="OutputThread")
         output_handler_thread.start()
         jessica.log_mind_event("SYSTEM", "Output thread started.")
-        while life_thread.is_alive():
-            life_thread.join(timeout=1)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: jessica.stop())
+        # A blocking wait can't be interrupted by Ctrl+C on Windows, so there it wakes once a second for the handler to run.
+        wait_timeout = 1.0 if sys.platform == "win32" else None
+        while not jessica.stop_event.wait(wait_timeout):
+            pass
+        log.info("[SYSTEM] Shutdown signal received. Saving state...")
+        jessica.stop()  # The life loop may have stopped on its own; make sure the output thread is told too.
+        output_handler_thread.join(timeout=2)
     except KeyboardInterrupt:
         log.info("\n[SYSTEM] Shutdown signal received. Saving state...")
     finally:
         jessica.shutdown()
+        if output_ring is not None:
+            output_ring.close()
         log.info("[SYSTEM] Shutdown complete.")
\ No newline at end of file
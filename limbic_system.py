@@ -1,4 +1,83 @@
-import time
+import logging
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+log = logging.getLogger("rich")
+
+# Per-tick decay factors for dopamine, oxytocin, serotonin and norepinephrine. Cortisol depends on location.
+_DECAY_D, _DECAY_O, _DECAY_S, _DECAY_N = 0.9830, 0.9865, 0.9933, 0.9899
+_CORTISOL_DECAY = (0.9724, 0.9473)  # Indexed by is_safe.
+_SAFE_LOCATIONS = frozenset(("Living Room", "Bedroom"))
+
+_INF = float("inf")
+# (mood, level index into (d, c, o, s, n), low, high, scale, offset): the mood scores offset + scale * level
+# while low < level < high, else 0. 'stable' is scored separately. Order breaks ties.
+_MOOD_TABLE = (
+    ('anxious', 1, 0.5, _INF, 1.0, 0.0),
+    ('stressed', 1, 0.6, _INF, 0.8, 0.0),
+    ('elated', 0, 0.8, _INF, 1.0, 0.0),
+    ('motivated', 0, 0.6, _INF, 1.0, 0.0),
+    ('melancholic', 3, -_INF, 0.4, -1.0, 1.0),
+    ('content', 2, 0.6, _INF, 1.0, 0.0),
+    ('focused', 4, 0.7, _INF, 1.0, 0.0),
+)
+
+def _clamp01(value):
+    # Levels are almost always already in range, so test that first.
+    return value if 0.0 <= value <= 1.0 else (0.0 if value < 0.0 else 1.0)
+
+def _limbic_step(d, c, o, s, n, energy, hunger, creativity_drive_urgency, understanding_drive_urgency,
+                 drives_urgency_mean, time_since_interaction, is_safe, is_asleep,
+                 fear_of_abandonment, stress_resilience, mood_stability_trait, curiosity_trait):
+    """One tick of neurotransmitter dynamics on plain floats. Returns the clamped (d, c, o, s, n)."""
+    overall_need_satisfaction = (energy + hunger) / 2.0
+
+    d *= _DECAY_D
+    c *= _CORTISOL_DECAY[int(is_safe)]
+    o *= _DECAY_O
+    s *= _DECAY_S
+    n *= _DECAY_N
+
+    stress_from_needs = ((1.0 - energy) + (1.0 - hunger)) * 0.0167
+    stress_from_drives = drives_urgency_mean * 0.0067
+    stress_from_loneliness = 0.0
+    if time_since_interaction > 3600:
+        loneliness_factor = min((time_since_interaction / 14400), 1.0)
+        stress_from_loneliness = loneliness_factor * fear_of_abandonment * 0.005
+
+    if creativity_drive_urgency < 0.1:
+        c *= 0.965
+
+    c += (stress_from_needs + stress_from_drives + stress_from_loneliness)
+    c -= (o * 0.0267) + (s * 0.0267)
+
+    if time_since_interaction < 600:
+        o += 0.0133
+
+    if c > 0.7:
+        s -= (c - 0.7) * 0.0033 * stress_resilience
+    if overall_need_satisfaction > 0.8:
+        s += (overall_need_satisfaction - 0.8) * 0.0067 * mood_stability_trait
+
+    reward_from_needs_met = (1.0 - (1.0 - overall_need_satisfaction)**2) * 0.0033
+    reward_from_understanding = (1.0 - understanding_drive_urgency) * 0.005 * curiosity_trait
+    reward_from_creativity = (1.0 - creativity_drive_urgency) * 0.0033
+    d += reward_from_needs_met + reward_from_understanding + reward_from_creativity
+    if d > 0.9:
+        d *= 0.95
+
+    if is_asleep:
+        c *= 0.928
+        s = _clamp01(s + 0.0167)
+
+    return _clamp01(d), _clamp01(c), _clamp01(o), _clamp01(s), _clamp01(n)
+
+if njit is not None:
+    _clamp01 = njit(cache=True)(_clamp01)
+    _limbic_step = njit(cache=True)(_limbic_step)
 
 class LimbicState:
     def __init__(self, genetic_code):
@@ -15,90 +94,59 @@ class LimbicState:
 
     def update(self, psyche_state):
         needs = psyche_state.somatic.needs
-        drives = psyche_state.alterable_persona.get('core_drives', {})
-        time_since_interaction = time.time() - psyche_state.last_interaction_time
-        current_location = psyche_state.world_manager.get_current_location_data()
-        
+        drives = psyche_state.alterable_persona.get('core_drives') or {}
+        time_since_interaction = psyche_state.tick_time - psyche_state.last_interaction_time
+        is_safe = psyche_state.world_manager.get_current_location_data().get("name") in _SAFE_LOCATIONS
+
         energy = needs.get('energy', 0.0)
         hunger = needs.get('hunger', 0.0)
-        overall_need_satisfaction = (energy + hunger) / 2.0
-
-        is_safe = current_location.get("name") in ["Living Room", "Bedroom"]
-        cortisol_decay_rate = 0.9473 if is_safe else 0.9724
-
-        self.dopamine *= 0.9830
-        self.cortisol *= cortisol_decay_rate
-        self.oxytocin *= 0.9865
-        self.serotonin *= 0.9933
-        self.norepinephrine *= 0.9899
-
-        stress_from_needs = ((1.0 - energy) + (1.0 - hunger)) * 0.0167
-        stress_from_drives = sum(d.get('urgency', 0) for d in drives.values()) / len(drives) * 0.0067 if drives else 0
-        stress_from_loneliness = 0
-        if time_since_interaction > 3600:
-            loneliness_factor = min((time_since_interaction / 14400), 1.0)
-            stress_from_loneliness = loneliness_factor * self.fear_of_abandonment * 0.005
-        
         creativity_drive_urgency = drives.get('creativity', {}).get('urgency', 1.0)
+        understanding_drive_urgency = drives.get('understanding', {}).get('urgency', 1.0)
+
         if creativity_drive_urgency < 0.1:
-             self.cortisol *= 0.965
-             psyche_state.log_mind_event("LIMBIC_STATE", "Felt a sense of pride from creative expression, reducing stress.")
-
-        self.cortisol += (stress_from_needs + stress_from_drives + stress_from_loneliness)
-        self.cortisol -= (self.oxytocin * 0.0267) + (self.serotonin * 0.0267)
-
-        if time_since_interaction < 600:
-            self.oxytocin += 0.0133
-
-        if self.cortisol > 0.7:
-            self.serotonin -= (self.cortisol - 0.7) * 0.0033 * self.stress_resilience
-        if overall_need_satisfaction > 0.8:
-            self.serotonin += (overall_need_satisfaction - 0.8) * 0.0067 * self.mood_stability_trait
-            
-        reward_from_needs_met = (1.0 - (1.0 - overall_need_satisfaction)**2) * 0.0033
-        reward_from_understanding = (1.0 - drives.get('understanding', {}).get('urgency', 1.0)) * 0.005 * self.curiosity_trait
-        reward_from_creativity = (1.0 - creativity_drive_urgency) * 0.0033
-        self.dopamine += reward_from_needs_met + reward_from_understanding + reward_from_creativity
-        if psyche_state.limbic.dopamine > 0.9:
-            self.dopamine *= 0.95
-
-        if psyche_state.is_asleep:
-            self.cortisol *= 0.928
-            self.serotonin = min(1.0, self.serotonin + 0.0167)
-
-        self.dopamine = max(0.0, min(1.0, self.dopamine))
-        self.cortisol = max(0.0, min(1.0, self.cortisol))
-        self.oxytocin = max(0.0, min(1.0, self.oxytocin))
-        self.serotonin = max(0.0, min(1.0, self.serotonin))
-        self.norepinephrine = max(0.0, min(1.0, self.norepinephrine))
+            psyche_state.log_mind_event("LIMBIC_STATE", "Felt a sense of pride from creative expression, reducing stress.")
+        drives_urgency_mean = 0.0
+        if drives:
+            total = 0.0
+            for drive in drives.values():
+                total += drive.get('urgency', 0)
+            drives_urgency_mean = total / len(drives)
+
+        self.dopamine, self.cortisol, self.oxytocin, self.serotonin, self.norepinephrine = _limbic_step(
+            self.dopamine, self.cortisol, self.oxytocin, self.serotonin, self.norepinephrine,
+            energy, hunger, creativity_drive_urgency, understanding_drive_urgency, drives_urgency_mean,
+            float(time_since_interaction), is_safe, bool(psyche_state.is_asleep),
+            self.fear_of_abandonment, self.stress_resilience, self.mood_stability_trait, self.curiosity_trait)
 
         self._update_mood_profile()
-        log_msg = (f"Mood: {self.mood_profile['primary']} {self.mood_profile['secondary']} | "
-                   f"D:{self.dopamine:.2f} C:{self.cortisol:.2f} O:{self.oxytocin:.2f} "
-                   f"S:{self.serotonin:.2f} N:{self.norepinephrine:.2f}")
-        psyche_state.log_mind_event("LIMBIC_STATE", log_msg)
+        if log.isEnabledFor(logging.INFO):
+            log_msg = (f"Mood: {self.mood_profile['primary']} {self.mood_profile['secondary']} | "
+                       f"D:{self.dopamine:.2f} C:{self.cortisol:.2f} O:{self.oxytocin:.2f} "
+                       f"S:{self.serotonin:.2f} N:{self.norepinephrine:.2f}")
+            psyche_state.log_mind_event("LIMBIC_STATE", log_msg)
 
     def _update_mood_profile(self):
-        moods = {}
-        moods['anxious'] = self.cortisol if self.cortisol > 0.5 else 0
-        moods['stressed'] = self.cortisol * 0.8 if self.cortisol > 0.6 else 0
-        moods['elated'] = self.dopamine if self.dopamine > 0.8 else 0
-        moods['motivated'] = self.dopamine if self.dopamine > 0.6 else 0
-        moods['melancholic'] = 1.0 - self.serotonin if self.serotonin < 0.4 else 0
-        moods['content'] = self.oxytocin if self.oxytocin > 0.6 else 0
-        moods['focused'] = self.norepinephrine if self.norepinephrine > 0.7 else 0
-        moods['stable'] = (self.serotonin - abs(self.serotonin - 0.5)) * 1.5
-        
-        if not moods or all(v == 0 for v in moods.values()):
+        levels = (self.dopamine, self.cortisol, self.oxytocin, self.serotonin, self.norepinephrine)
+        moods = [(mood, offset + scale * levels[i] if low < levels[i] < high else 0)
+                 for mood, i, low, high, scale, offset in _MOOD_TABLE]
+        serotonin = levels[3]
+        moods.append(('stable', (serotonin - abs(serotonin - 0.5)) * 1.5))
+        # Single pass keeping the three strongest (value, mood) pairs; earlier moods win ties.
+        top = []
+        any_mood = False
+        for mood, value in moods:
+            if value != 0:
+                any_mood = True
+            i = len(top)
+            while i and value > top[i - 1][0]:
+                i -= 1
+            if i < 3:
+                top.insert(i, (value, mood))
+                del top[3:]
+
+        if not any_mood:
             self.mood_profile = {"primary": "neutral", "secondary": []}
             return
-            
-        primary_mood = max(moods, key=moods.get)
-        self.mood_profile["primary"] = primary_mood
-        
-        secondary_moods = []
-        for mood, value in sorted(moods.items(), key=lambda item: item[1], reverse=True):
-            if mood != primary_mood and value > 0.5:
-                secondary_moods.append(mood)
-        
-        self.mood_profile["secondary"] = secondary_moods[:2]
\ No newline at end of file
+
+        self.mood_profile["primary"] = top[0][1]
+        self.mood_profile["secondary"] = [mood for value, mood in top[1:] if value > 0.5]
\ No newline at end of file
@@ -0,0 +1,124 @@
+import struct
+from multiprocessing import shared_memory
+
+RING_NAME = "jessica_output_ring"
+RING_SIZE = 1 << 16
+
+_HEADER = struct.Struct("<QQQ")  # head, tail: monotonically increasing byte offsets; closed: set on clean exit
+_LENGTH = struct.Struct("<I")
+# Marks a line of the output file whose message the ring turned away, so ring readers know to take it from the file.
+REJECTED_PREFIX = "!"
+
+class MessageRing:
+    """
+    Single-producer/single-consumer byte ring in a named shared memory segment.
+    The producer only advances `tail` and the consumer only advances `head`, so no lock is needed.
+    Each record is a u32 length followed by the payload bytes.
+    A producer that exits cleanly marks the segment closed before unlinking it, so an attached consumer knows to
+    re-attach to the next one instead of draining a dead mapping forever.
+    """
+
+    def __init__(self, shm, owner):
+        self._shm = shm
+        self._buf = shm.buf
+        self._owner = owner
+        self._capacity = shm.size - _HEADER.size
+
+    @classmethod
+    def create(cls, name=RING_NAME, size=RING_SIZE):
+        """Creates (or takes over a stale) segment for the producer side."""
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            shm = shared_memory.SharedMemory(name=name)
+        ring = cls(shm, owner=True)
+        _HEADER.pack_into(ring._buf, 0, 0, 0, 0)
+        return ring
+
+    @classmethod
+    def attach(cls, name=RING_NAME, from_start=False):
+        """
+        Attaches the consumer side to an existing segment. Returns None if the producer isn't running.
+        Only messages written after attaching are delivered, unless `from_start` (used when following a restart).
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return None
+        try:
+            # The producer owns the segment; stop our resource tracker from unlinking it on exit.
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        ring = cls(shm, owner=False)
+        head, tail, closed = _HEADER.unpack_from(ring._buf, 0)
+        if closed:
+            ring.close()
+            return None
+        if not from_start:
+            ring._set_head(tail)
+        return ring
+
+    @property
+    def closed(self):
+        """True once the producer has shut down; the segment will get no more messages."""
+        return _HEADER.unpack_from(self._buf, 0)[2] != 0
+
+    def _set_head(self, head):
+        struct.pack_into("<Q", self._buf, 0, head)
+
+    def _set_tail(self, tail):
+        struct.pack_into("<Q", self._buf, 8, tail)
+
+    def _copy_in(self, offset, data):
+        start = _HEADER.size + offset % self._capacity
+        first = min(len(data), _HEADER.size + self._capacity - start)
+        self._buf[start:start + first] = data[:first]
+        if first < len(data):
+            self._buf[_HEADER.size:_HEADER.size + len(data) - first] = data[first:]
+
+    def _copy_out(self, offset, length):
+        start = _HEADER.size + offset % self._capacity
+        first = min(length, _HEADER.size + self._capacity - start)
+        data = bytes(self._buf[start:start + first])
+        if first < length:
+            data += bytes(self._buf[_HEADER.size:_HEADER.size + length - first])
+        return data
+
+    def put(self, payload):
+        """Writes one message. Returns False (dropping it) if the consumer has fallen too far behind."""
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        record = _LENGTH.pack(len(payload)) + payload
+        head, tail = _HEADER.unpack_from(self._buf, 0)[:2]
+        if len(record) > self._capacity - (tail - head):
+            return False
+        self._copy_in(tail, record)
+        self._set_tail(tail + len(record))
+        return True
+
+    def get_all(self):
+        """Returns every message written since the last call, oldest first."""
+        head, tail = _HEADER.unpack_from(self._buf, 0)[:2]
+        if tail < head:  # The producer restarted and reset the ring.
+            self._set_head(tail)
+            return []
+        messages = []
+        while head < tail:
+            (length,) = _LENGTH.unpack(self._copy_out(head, _LENGTH.size))
+            messages.append(self._copy_out(head + _LENGTH.size, length).decode("utf-8"))
+            head += _LENGTH.size + length
+        self._set_head(head)
+        return messages
+
+    def close(self):
+        if self._owner:
+            struct.pack_into("<Q", self._buf, 16, 1)
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
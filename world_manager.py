@@ -2,19 +2,44 @@ import time
 import random
 import math
 import json
-import re
 import heapq
+import fast_json
+
+_OPPOSITE = {"north": "south", "south": "north", "east": "west", "west": "east", "up": "down", "down": "up"}
+_DIR_DELTA = {"north": (0, 1, 0), "south": (0, -1, 0), "east": (1, 0, 0), "west": (-1, 0, 0), "up": (0, 0, 1), "down": (0, 0, -1)}
 
 class WorldManager:
     def __init__(self, psyche):
         self.psyche = psyche
         self.zones = self._load_zones()
         self.object_templates = self._load_object_templates()
+        # Tuple-keyed view of world_data["grid"] (whose "x,y,z" string keys are what gets saved) plus a name index.
+        # Both share the grid's location dicts and are rebuilt if the grid is replaced or gains entries behind our back.
+        self._indexed_grid = None
+        self._grid_by_tuple = {}
+        self._coords_by_name = {}
+        # Puddle bookkeeping for _update_dynamic_objects, as insertion-ordered dicts of coords (grid order).
+        self._puddle_coords = {}
+        self._dry_outdoor_coords = {}
+        self._dynamic_inputs = None  # (time_of_day, weather) as of the last _update_dynamic_objects pass.
+        self._zone_cache = {}  # coords tuple -> theme; zones are static for the run.
+        self._compiled_zones = None
+        # find_path scratch space, cleared and reused on each call so the dicts keep their grown size.
+        # This makes find_path non-reentrant: callers must not run it from two threads at once.
+        self._path_open = []
+        self._path_came_from = {}
+        self._path_g = {}
+        # Last get_current_location_data answer, valid while both the coords tuple and the grid index are the same objects.
+        # Every writer stores a fresh tuple, so a move always misses.
+        self._current_coords = None
+        self._current_grid = None
+        self._current_loc = None
+        self._time_of_day = None
+        self._time_of_day_until = 0.0  # Start of the next local hour; the time of day can't change before then.
 
     def _load_zones(self):
         try:
-            with open('world_zones.json', 'r') as f:
-                return json.load(f)
+            return fast_json.load_file('world_zones.json')
         except (FileNotFoundError, json.JSONDecodeError):
             self.psyche.log_mind_event("WARNING", "world_zones.json not found or invalid. Zone themes will not be applied.")
             return {}
@@ -50,63 +75,112 @@ class WorldManager:
         def heuristic(a, b):
             return abs(a[0] - b[0]) + abs(a[1] - b[1]) + abs(a[2] - b[2])
 
-        open_set = []
-        heapq.heappush(open_set, (0, start_node))
-        
-        came_from = {}
-        g_score = {start_node: 0}
-        f_score = {start_node: heuristic(start_node, goal_node)}
-
-        grid = self.psyche.world_data.get("grid", {})
+        open_set = self._path_open
+        came_from = self._path_came_from  # node -> (previous node, direction taken from it)
+        g_score = self._path_g
+        open_set.clear()
+        came_from.clear()
+        g_score.clear()
+        open_set.append((heuristic(start_node, goal_node), start_node))
+        g_score[start_node] = 0
+        grid = self._grid_index()
 
         while open_set:
-            _, current_tuple = heapq.heappop(open_set)
+            f, current_tuple = heapq.heappop(open_set)
 
             if current_tuple == goal_node:
                 path = []
                 while current_tuple in came_from:
-                    previous_tuple = came_from[current_tuple]
-                    previous_loc = self.get_location_at(*previous_tuple)
-                    if previous_loc:
-                        for direction, coords in previous_loc.get("connections", {}).items():
-                            if tuple(coords) == current_tuple:
-                                path.append(direction)
-                                break
-                    current_tuple = previous_tuple
+                    current_tuple, direction = came_from[current_tuple]
+                    path.append(direction)
                 return path[::-1]
 
-            current_loc_data = self.get_location_at(*current_tuple)
+            current_g = g_score[current_tuple]
+            if f > current_g + heuristic(current_tuple, goal_node):
+                continue  # Stale entry: this node was pushed again with a better score since.
+
+            current_loc_data = grid.get(current_tuple)
             if not current_loc_data:
                 continue
 
+            tentative_g_score = current_g + 1
             for direction, neighbor_coords_list in current_loc_data.get("connections", {}).items():
                 neighbor_tuple = tuple(neighbor_coords_list)
-                tentative_g_score = g_score[current_tuple] + 1
-
-                if tentative_g_score < g_score.get(neighbor_tuple, float('inf')):
-                    came_from[neighbor_tuple] = current_tuple
+                if tentative_g_score < g_score.get(neighbor_tuple, math.inf):
+                    came_from[neighbor_tuple] = (current_tuple, direction)
                     g_score[neighbor_tuple] = tentative_g_score
-                    f_score[neighbor_tuple] = tentative_g_score + heuristic(neighbor_tuple, goal_node)
-                    if neighbor_tuple not in [i[1] for i in open_set]:
-                        heapq.heappush(open_set, (f_score[neighbor_tuple], neighbor_tuple))
-                        
+                    heapq.heappush(open_set, (tentative_g_score + heuristic(neighbor_tuple, goal_node), neighbor_tuple))
+
         self.psyche.log_mind_event("ACTION_FAILURE", f"Pathfinding failed: Could not find a path from {start_coords} to {goal_coords}.")
         return None
     
-    def find_coords_by_name(self, name):
+    def _grid_index(self):
         grid = self.psyche.world_data.get("grid", {})
-        for coords_str, loc_data in grid.items():
-            if loc_data.get("name", "").lower() == name.lower():
-                return [int(c) for c in coords_str.split(',')]
-        return None
+        if grid is not self._indexed_grid or len(grid) != len(self._grid_by_tuple):
+            self._grid_by_tuple = {tuple(int(c) for c in key.split(',')): loc for key, loc in grid.items()}
+            self._coords_by_name = {}
+            self._puddle_coords = {}
+            self._dry_outdoor_coords = {}
+            for coords, loc in self._grid_by_tuple.items():
+                self._index_location(coords, loc)
+            self._indexed_grid = grid
+        return self._grid_by_tuple
+
+    def _index_location(self, coords, location_data):
+        self._coords_by_name.setdefault(location_data.get("name", "").lower(), coords)
+        if 'puddle' in location_data.get('objects', ()):
+            self._puddle_coords[coords] = None
+        elif location_data.get('type') == 'outdoor':
+            self._dry_outdoor_coords[coords] = None
+
+    def _add_location(self, coords, location_data):
+        grid_by_tuple = self._grid_index()
+        coords = tuple(coords)
+        self.psyche.world_data["grid"][f"{coords[0]},{coords[1]},{coords[2]}"] = location_data
+        grid_by_tuple[coords] = location_data
+        self._index_location(coords, location_data)
+
+    def find_coords_by_name(self, name):
+        self._grid_index()
+        coords = self._coords_by_name.get(name.lower())
+        return list(coords) if coords is not None else None
 
     def get_location_at(self, x, y, z):
-        return self.psyche.world_data.get("grid", {}).get(f"{x},{y},{z}")
+        return self._grid_index().get((x, y, z))
 
     def get_current_location_data(self):
         coords = self.psyche.world_data.get("current_location_coords")
         if not coords: return None
-        return self.get_location_at(coords[0], coords[1], coords[2])
+        grid_by_tuple = self._grid_index()
+        if coords is self._current_coords and grid_by_tuple is self._current_grid:
+            return self._current_loc
+        location = grid_by_tuple.get((coords[0], coords[1], coords[2]))
+        if location is not None:
+            self._current_coords, self._current_grid, self._current_loc = coords, grid_by_tuple, location
+        return location
+
+    def describe_surroundings(self, depth=2):
+        """Maps each known room within `depth` moves of here to its exits: {room name: {direction: room name}}."""
+        coords = self.psyche.world_data.get("current_location_coords")
+        if not coords: return {}
+        surroundings = {}
+        seen = {tuple(coords)}
+        frontier = [tuple(coords)]
+        for _ in range(depth + 1):
+            next_frontier = []
+            for x, y, z in frontier:
+                loc = self.get_location_at(x, y, z)
+                if not loc: continue
+                exits = {}
+                for direction, target in loc.get("connections", {}).items():
+                    target_loc = self.get_location_at(*target)
+                    exits[direction] = target_loc.get("name", "somewhere unknown") if target_loc else "somewhere unexplored"
+                    if tuple(target) not in seen:
+                        seen.add(tuple(target))
+                        next_frontier.append(tuple(target))
+                surroundings[loc.get("name", f"{x},{y},{z}")] = exits
+            frontier = next_frontier
+        return surroundings
 
     def get_objects_in_current_room(self):
         current_loc = self.get_current_location_data()
@@ -133,7 +207,15 @@ class WorldManager:
         time_of_day = self.psyche.world_data.get('time_of_day')
         weather = self.psyche.world_data.get('weather')
         all_objects = self.psyche.world_data.get('objects', {})
-        grid = self.psyche.world_data.get('grid', {})
+        grid_by_tuple = self._grid_index()
+
+        # Nothing to do unless the time or weather moved, or the weather still has puddles to dry or to fill.
+        inputs = (time_of_day, weather)
+        if (inputs == self._dynamic_inputs
+                and not (weather == 'Sunny' and self._puddle_coords)
+                and not (weather in ['Rainy', 'Stormy'] and self._dry_outdoor_coords)):
+            return
+        self._dynamic_inputs = inputs
 
         for obj_name, obj_data in all_objects.items():
             if obj_name == 'street_lamp':
@@ -143,28 +225,36 @@ class WorldManager:
                     obj_data['state'] = 'on' if should_be_on else 'off'
                     self.psyche.log_mind_event("WORLD", f"A nearby street lamp flickers and turns {obj_data['state']}.")
             
-            if obj_name == 'puddle' and weather == 'Sunny':
-                for loc_data in grid.values():
-                    if 'puddle' in loc_data.get('objects', []):
-                        loc_data['objects'].remove('puddle')
-                        self.psyche.log_mind_event("WORLD", "The warmth of the sun has dried up a nearby puddle.")
-                        break
-        
-        if weather in ['Rainy', 'Stormy']:
-            for loc_data in grid.values():
-                if loc_data.get('type') == 'outdoor' and 'puddle' not in loc_data.get('objects', []):
-                    loc_data['objects'].append('puddle')
-                    if 'puddle' not in all_objects:
-                        all_objects['puddle'] = self.object_templates.get('puddle', {})
-                    self.psyche.log_mind_event("WORLD", "Rain begins to collect in a puddle on the ground.")
-                    break
+            if obj_name == 'puddle' and weather == 'Sunny' and self._puddle_coords:
+                coords = next(iter(self._puddle_coords))
+                del self._puddle_coords[coords]
+                loc_data = grid_by_tuple[coords]
+                loc_data['objects'].remove('puddle')
+                if loc_data.get('type') == 'outdoor':
+                    self._dry_outdoor_coords[coords] = None
+                self.psyche.log_mind_event("WORLD", "The warmth of the sun has dried up a nearby puddle.")
+
+        if weather in ['Rainy', 'Stormy'] and self._dry_outdoor_coords:
+            coords = next(iter(self._dry_outdoor_coords))
+            del self._dry_outdoor_coords[coords]
+            self._puddle_coords[coords] = None
+            grid_by_tuple[coords].setdefault('objects', []).append('puddle')
+            if 'puddle' not in all_objects:
+                all_objects['puddle'] = self.object_templates.get('puddle', {})
+            self.psyche.log_mind_event("WORLD", "Rain begins to collect in a puddle on the ground.")
 
     def _get_time_of_day(self):
-        hour = time.localtime().tm_hour
-        if 5 <= hour < 12: return "Morning"
-        elif 12 <= hour < 17: return "Afternoon"
-        elif 17 <= hour < 21: return "Evening"
-        else: return "Night"
+        now = self.psyche.tick_time
+        if now < self._time_of_day_until:
+            return self._time_of_day
+        local = time.localtime(now)
+        self._time_of_day_until = int(now) - local.tm_min * 60 - local.tm_sec + 3600
+        hour = local.tm_hour
+        if 5 <= hour < 12: self._time_of_day = "Morning"
+        elif 12 <= hour < 17: self._time_of_day = "Afternoon"
+        elif 17 <= hour < 21: self._time_of_day = "Evening"
+        else: self._time_of_day = "Night"
+        return self._time_of_day
 
     def get_dynamic_description(self, location_data):
         base_desc = location_data.get("description", "It's an empty space.")
@@ -194,7 +284,7 @@ class WorldManager:
                 return False
         
         target_coords = current_loc_data["connections"][direction]
-        self.psyche.world_data["current_location_coords"] = target_coords
+        self.psyche.world_data["current_location_coords"] = tuple(target_coords)
         new_loc_data = self.get_location_at(*target_coords)
         
         dynamic_narration = self.get_dynamic_description(new_loc_data)
@@ -202,31 +292,37 @@ class WorldManager:
         return True
 
     def _get_zone_for_coords(self, coords):
-        if not self.zones: return None
-        
+        key = tuple(coords)
+        if key not in self._zone_cache:
+            if len(self._zone_cache) >= 4096:
+                self._zone_cache.clear()
+            self._zone_cache[key] = self._find_zone_theme(key)
+        return self._zone_cache[key]
+
+    def _compile_zones(self):
+        """Flattens the zone atlas into (box, excluded boxes, theme) tuples, in file order; a box is (x0, x1, y0, y1, z0, z1)."""
+        def box(zone):
+            bounds = zone.get('bounds') if isinstance(zone, dict) else None
+            if not bounds: return None
+            return (bounds['x'][0], bounds['x'][1], bounds['y'][0], bounds['y'][1], bounds['z'][0], bounds['z'][1])
+
+        compiled = []
         for zone_name, zone_data in self.zones.items():
             if zone_name.startswith("_"): continue
-            
-            bounds = zone_data.get('bounds')
-            if not bounds: continue
-
-            if 'exclude' in zone_data:
-                is_excluded = False
-                for excluded_zone_name in zone_data['exclude']:
-                    excluded_zone = self.zones.get(excluded_zone_name, {})
-                    excluded_bounds = excluded_zone.get('bounds')
-                    if excluded_bounds and (excluded_bounds['x'][0] <= coords[0] <= excluded_bounds['x'][1] and
-                                           excluded_bounds['y'][0] <= coords[1] <= excluded_bounds['y'][1] and
-                                           excluded_bounds['z'][0] <= coords[2] <= excluded_bounds['z'][1]):
-                        is_excluded = True
-                        break
-                if is_excluded:
-                    continue
-
-            if (bounds['x'][0] <= coords[0] <= bounds['x'][1] and
-                bounds['y'][0] <= coords[1] <= bounds['y'][1] and
-                bounds['z'][0] <= coords[2] <= bounds['z'][1]):
-                return zone_data.get('theme')
+            zone_box = box(zone_data)
+            if not zone_box: continue
+            excluded = tuple(b for b in (box(self.zones.get(name, {})) for name in zone_data.get('exclude', ())) if b)
+            compiled.append((zone_box, excluded, zone_data.get('theme')))
+        return compiled
+
+    def _find_zone_theme(self, coords):
+        if self._compiled_zones is None:
+            self._compiled_zones = self._compile_zones()
+        x, y, z = coords
+        for (x0, x1, y0, y1, z0, z1), excluded, theme in self._compiled_zones:
+            if not (x0 <= x <= x1 and y0 <= y <= y1 and z0 <= z <= z1): continue
+            if any(ex0 <= x <= ex1 and ey0 <= y <= ey1 and ez0 <= z <= ez1 for ex0, ex1, ey0, ey1, ez0, ez1 in excluded): continue
+            return theme
         return None
 
     def _discover_and_generate_location(self, source_coords, direction_moved):
@@ -237,14 +333,9 @@ class WorldManager:
 
         mood = self.psyche.limbic.mood_profile['primary']
 
-        new_coords = list(source_coords)
-        if direction_moved == 'north': new_coords[1] += 1
-        elif direction_moved == 'south': new_coords[1] -= 1
-        elif direction_moved == 'east': new_coords[0] += 1
-        elif direction_moved == 'west': new_coords[0] -= 1
-        elif direction_moved == 'up': new_coords[2] += 1
-        elif direction_moved == 'down': new_coords[2] -= 1
-        else: return False
+        delta = _DIR_DELTA.get(direction_moved)
+        if delta is None: return False
+        new_coords = [source_coords[0] + delta[0], source_coords[1] + delta[1], source_coords[2] + delta[2]]
 
         zone_theme = self._get_zone_for_coords(new_coords)
         
@@ -259,15 +350,14 @@ class WorldManager:
             elif source_location.get("type") == "outdoor" and direction_moved not in ['up', 'down']:
                 context_prompt = "I am already outside and walking down the street. The new location should be another plausible outdoor area or the entrance to a public building (e.g., 'Park Entrance', 'Storefront', 'Bus Stop')."
 
-        grid = self.psyche.world_data.get("grid", {})
-        nearby_locations = [loc['name'] for loc in grid.values()]
+        nearby_locations = list({loc['name'] for loc in self._grid_index().values()})
 
         genesis_prompt = f"""
         I am Jessica, exploring my world. My current location is a '{source_location.get('name')}' ({source_location.get('type')}). My primary mood is {mood}.
         My instruction is: "{context_prompt}"
         I am moving '{direction_moved}'.
         Let my mood subtly influence the atmosphere or type of location I discover. For instance, a melancholic mood might lead to finding a quiet, solitary place, while an elated mood might lead to a more vibrant, social area.
-        Nearby locations that already exist are: {json.dumps(list(set(nearby_locations)))}
+        Nearby locations that already exist are: {fast_json.dumps(nearby_locations)}
 
         Generate a new, interesting, and plausible location based on these facts. Do not create a location with a name similar to one that already exists.
         Describe this new place as a strict JSON object:
@@ -291,17 +381,11 @@ class WorldManager:
         new_loc_json = None
         for _ in range(2):
             raw_response = self.psyche.conscious._safe_generate_content(genesis_prompt)
-            if raw_response:
-                match = re.search(r'\{.*\}', raw_response, re.DOTALL)
-                if match:
-                    try:
-                        parsed_json = json.loads(match.group(), strict=False)
-                        if "name" in parsed_json and "description" in parsed_json:
-                            new_loc_json = parsed_json
-                            break
-                    except (json.JSONDecodeError, KeyError):
-                        continue
-        
+            parsed_json = fast_json.parse_embedded(raw_response) if raw_response else None
+            if isinstance(parsed_json, dict) and "name" in parsed_json and "description" in parsed_json:
+                new_loc_json = parsed_json
+                break
+
         if not new_loc_json:
             self.psyche.log_mind_event("WORLD_GEN", "All world generation attempts failed.")
             return False
@@ -311,20 +395,18 @@ class WorldManager:
             if obj_name not in world_objects:
                 world_objects[obj_name] = self.object_templates.get(obj_name, {"description": f"I see a {obj_name.replace('_', ' ')} here."})
         
-        opposite_map = {"north": "south", "south": "north", "east": "west", "west": "east", "up": "down", "down": "up"}
-        
         new_location_data = {
             "name": new_loc_json["name"],
             "description": new_loc_json["description"],
             "objects": new_loc_json.get("objects", []),
-            "connections": {opposite_map[direction_moved]: source_coords},
+            "connections": {_OPPOSITE[direction_moved]: source_coords},
             "type": new_loc_json.get("type", "outdoor")
         }
 
         source_location["connections"][direction_moved] = new_coords
         
-        self.psyche.world_data["grid"][f"{new_coords[0]},{new_coords[1]},{new_coords[2]}"] = new_location_data
+        self._add_location(new_coords, new_location_data)
         self.psyche.log_mind_event("WORLD_GEN", f"Discovery at {new_coords} solidified into: '{new_location_data['name']}'. Path is now two-way.")
         
-        self.psyche.save_state()
+        self.psyche.request_save("world")
         return True
\ No newline at end of file